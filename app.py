@@ -1,41 +1,38 @@
 from config.styles import apply_custom_styles, header_section, sidebar_navigation, set_page_config
-from core.database import init_db
-from config.settings import DB_PATH
+from core.resources import init_local_db, check_supabase, get_backend
+from config.settings import STORAGE_BACKEND
 import streamlit as st
-from page_modules.writing_practise import writing
-from page_modules.vocab_builder import vocab_builder
-from page_modules.vocab_practise import vocab_practise
-from page_modules.transcript_viewer import transcript_render
-from page_modules.performance_analyser import analyse
+import importlib
 
 import warnings
 warnings.filterwarnings("ignore")
 
+# Page name -> (module, render function). Modules are imported only when their
+# page is selected, so the heavy dependencies of other pages never load.
+PAGES = {
+    "Practise Writing": ("page_modules.writing_practise", "writing"),
+    "Explore Vocabulary": ("page_modules.vocab_builder", "vocab_builder"),
+    "Practise Vocabulary": ("page_modules.vocab_practise", "vocab_practise"),
+    "Update Transcript": ("page_modules.transcript_viewer", "transcript_render"),
+    "Progress Tracker": ("page_modules.performance_analyser", "analyse"),
+}
+
 
 def main():
     set_page_config()
     apply_custom_styles()
     
-    # Initialize databases
+    # Initialize databases (schema init runs once per process, the Supabase probe is cached)
     try:
         # Initialize SQLite database (for fallback or local development)
-        init_db(DB_PATH)
+        init_local_db()
         
-        # Initialize Supabase connection
-        try:
-            from core.database_supabase import SupabaseDB
-            supabase_client = SupabaseDB()
-            
-            # Test Supabase connection
-            test_words = supabase_client.get_all_saved_words()
-            st.session_state.db_status = "supabase"
-            
-        except ImportError as import_error:
-            st.warning(f"Supabase module import failed: {import_error}. Using local database.")
-            st.session_state.db_status = "local"
-        except Exception as supabase_error:
-            st.warning(f"Supabase connection failed: {supabase_error}. Using local database.")
-            st.session_state.db_status = "local"
+        # Check the Supabase connection when it may be used
+        if STORAGE_BACKEND == "auto":
+            supabase_ok, supabase_error = check_supabase()
+            if not supabase_ok:
+                st.warning(f"Supabase connection failed: {supabase_error}. Using local database.")
+        st.session_state.db_status = get_backend()
             
     except Exception as e:
         st.error(f"Database initialization failed: {e}")
@@ -47,7 +44,7 @@ def main():
     # Display database status in sidebar (optional for debugging)
     # if st.session_state.get('db_status') == 'supabase':
     #     st.sidebar.success("🌐 Connected to Supabase")
-    # elif st.session_state.get('db_status') == 'local':
+    # elif st.session_state.get('db_status') == 'sqlite':
     #     st.sidebar.info("💾 Using local database")
     # elif st.session_state.get('db_status') == 'error':
     #     st.sidebar.error("❌ Database error")
@@ -57,16 +54,10 @@ def main():
     
     # Route to appropriate page functions
     try:
-        if page == "Practise Writing":
-            writing()
-        elif page == "Explore Vocabulary":
-            vocab_builder()
-        elif page == "Practise Vocabulary":
-            vocab_practise()
-        elif page == "Update Transcript":
-            transcript_render()
-        elif page == "Progress Tracker":
-            analyse()
+        if page in PAGES:
+            module_name, function_name = PAGES[page]
+            render_page = getattr(importlib.import_module(module_name), function_name)
+            render_page()
         else:
             # Fallback - should never happen but good to have
             st.error("Page not found!")
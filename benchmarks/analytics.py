@@ -0,0 +1,90 @@
+"""
+Progress dashboard benchmark: the repository reads behind the Progress Tracker.
+
+Fills a repository with synthetic scores spread over a year and times the calls
+the dashboard makes on every view (score version, statistics, daily scores) and
+on a cache miss (score history). The default "memory" backend is the offline
+InMemoryRepository, so it runs without network access; "sqlite" runs the same
+calls against a throwaway database through SQLiteRepository.
+
+Usage (from the repository root):
+    python benchmarks/analytics.py [--backend memory|sqlite] [--scores 20000] [--repeat 100]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.repository import InMemoryRepository, SQLiteRepository
+
+CALLS = ["get_score_version", "get_score_statistics", "get_daily_scores", "get_score_history"]
+
+
+def synthetic_scores(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    start = datetime.now() - timedelta(days=365)
+    return [(f"sentence {i}", f"attempt {i}", rng.randint(0, 10),
+             (start + timedelta(minutes=26 * i)).strftime('%Y-%m-%d %H:%M:%S')) for i in range(count)]
+
+
+def memory_repository(scores):
+    repo = InMemoryRepository()
+    for sentence, user_translation, score, checked_on in scores:
+        repo.save_score(sentence, user_translation, score, checked_on=checked_on)
+    return repo
+
+
+def sqlite_repository(scores, db_path: Path):
+    import core.database as database
+    database.DB_PATH = db_path
+    database.init_db(db_path)
+    with database.get_pool(db_path).connection() as conn:
+        conn.executemany(
+            "INSERT INTO translation_scores (sentence, user_translation, score, checked_on) VALUES (?, ?, ?, ?)",
+            scores
+        )
+    return SQLiteRepository()
+
+
+def time_calls(fn, repeat: int) -> float:
+    """Mean milliseconds per call"""
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory", help="repository to time")
+    parser.add_argument("--scores", type=int, default=20000, help="synthetic score rows")
+    parser.add_argument("--repeat", type=int, default=100, help="calls per repository method")
+    args = parser.parse_args()
+
+    scores = synthetic_scores(args.scores)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        if args.backend == "memory":
+            repo = memory_repository(scores)
+        else:
+            repo = sqlite_repository(scores, db_path)
+
+        stats = repo.get_score_statistics()
+        print(f"{args.backend}: {stats['total_attempts']} scores over {stats['days_active']} days, "
+              f"{args.repeat} calls each\n")
+        print(f"{'call':<22} {'mean ms':>8}")
+        for name in CALLS:
+            print(f"{name:<22} {time_calls(getattr(repo, name), args.repeat):>8.2f}")
+        if args.backend == "sqlite":
+            from core.db_pool import get_pool
+            get_pool(db_path).close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Import-time regression benchmark for app.py.
+
+Runs `python -X importtime -c "import app"` in a fresh interpreter, prints the
+slowest imports and fails when startup pulls in a page-only heavy dependency or
+goes over the time budget.
+
+Usage (from the repository root):
+    python benchmarks/import_time.py [--budget-ms 400] [--top 15] [--output report.txt]
+"""
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+
+# Dependencies that must only load once the page that needs them is opened
+DEFERRED_MODULES = [
+    "pandas",
+    "altair",
+    "supabase",
+    "groq",
+    "gtts",
+    "speech_recognition",
+    "vosk",
+    "IPython",
+    "youtube_transcript_api",
+    "page_modules",
+]
+
+LINE_PATTERN = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(target: str = "app"):
+    """Return [(module, self_us, cumulative_us, depth)] for a fresh `import target`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BASE_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def build_report(rows, top: int) -> str:
+    total_us = next(cumulative for module, _, cumulative, depth in rows if depth == 0 and module == "app")
+    lines = [f"import app: {total_us / 1000:.1f} ms cumulative", "", f"Top {top} imports by cumulative time:"]
+    for module, self_us, cumulative_us, _ in sorted(rows, key=lambda row: row[2], reverse=True)[:top]:
+        lines.append(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {module}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=400, help="fail if `import app` takes longer")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    parser.add_argument("--output", type=Path, help="also write the report to this file")
+    args = parser.parse_args()
+
+    rows = measure()
+    report = build_report(rows, args.top)
+    print(report)
+    if args.output:
+        args.output.write_text(report + "\n", encoding="utf-8")
+
+    failures = []
+    loaded = {module for module, *_ in rows}
+    for name in DEFERRED_MODULES:
+        if name in loaded or any(module.startswith(f"{name}.") for module in loaded):
+            failures.append(f"{name} is imported at startup")
+    total_ms = next(cumulative for module, _, cumulative, depth in rows if depth == 0 and module == "app") / 1000
+    if total_ms > args.budget_ms:
+        failures.append(f"import app took {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
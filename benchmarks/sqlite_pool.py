@@ -0,0 +1,106 @@
+"""
+SQLite access benchmark: a new connection per call versus the shared pool.
+
+Builds a throwaway database with the app schema, fills it with synthetic scores
+and words, then times the read functions of core.database against it both ways:
+through the real pool, and with get_pool swapped for one that opens and closes a
+plain connection on every call. The functions run unchanged, so the SQL is always
+the app's; the DataFrame-returning ones include pandas overhead in both columns.
+
+Usage (from the repository root):
+    python benchmarks/sqlite_pool.py [--scores 20000] [--words 2000] [--repeat 300]
+"""
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import DB_TIMEOUT
+import core.database as database
+from core.database import init_db
+from core.db_pool import get_pool
+
+QUERIES = {
+    "score history": (database.get_score_history, ()),
+    "score version": (database.get_score_version, ()),
+    "daily scores": (database.get_daily_scores, ()),
+    "score statistics": (database.get_score_statistics, ()),
+    "saved words": (database.get_all_saved_words, ()),
+    "word lookup": (database.word_exists, ("mot00042",)),
+    "word count": (database.count_saved_words, ()),
+}
+
+
+def seed(db_path: Path, scores: int, words: int):
+    init_db(db_path)
+    start = datetime.now() - timedelta(days=365)
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO translation_scores (sentence, user_translation, score, checked_on) VALUES (?, ?, ?, ?)",
+            [(f"sentence {i}", f"attempt {i}", random.randint(0, 10),
+              (start + timedelta(minutes=26 * i)).strftime('%Y-%m-%d %H:%M:%S')) for i in range(scores)]
+        )
+        conn.executemany(
+            "INSERT INTO missing_words (word, meaning, added_on) VALUES (?, ?, ?)",
+            [(f"mot{i:05d}", f"word {i}", (start + timedelta(hours=i)).strftime('%Y-%m-%d %H:%M:%S'))
+             for i in range(words)]
+        )
+
+
+class PerCallPool:
+    """The previous access pattern: connect, query, commit and close on every call"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+
+    @contextmanager
+    def connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=DB_TIMEOUT)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def time_calls(fn, repeat: int) -> float:
+    """Mean microseconds per call"""
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scores", type=int, default=20000, help="synthetic translation_scores rows")
+    parser.add_argument("--words", type=int, default=2000, help="synthetic missing_words rows")
+    parser.add_argument("--repeat", type=int, default=300, help="calls per query and access pattern")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        seed(db_path, args.scores, args.words)
+        database.DB_PATH = db_path
+
+        print(f"{args.scores} scores, {args.words} words, {args.repeat} calls each\n")
+        print(f"{'query':<18} {'per-call µs':>12} {'pooled µs':>12} {'speedup':>8}")
+        for name, (fn, params) in QUERIES.items():
+            database.get_pool = lambda path: PerCallPool(path)
+            baseline = time_calls(lambda: fn(*params), args.repeat)
+            database.get_pool = get_pool
+            warm = time_calls(lambda: fn(*params), args.repeat)
+            print(f"{name:<18} {baseline:>12.1f} {warm:>12.1f} {baseline / warm:>7.1f}x")
+        get_pool(db_path).close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Vocabulary search benchmark.
+
+Saves synthetic French-like words to an InMemoryRepository, builds the
+VocabSearchIndex from it as the Explore Vocabulary page does, and times exact,
+prefix, accent-folded, meaning and misspelled queries. "found" is the share of
+queries whose source word is returned (any result, for prefix and meaning
+queries). Fails when a query type's mean latency exceeds the budget.
+
+Usage (from the repository root):
+    python benchmarks/vocab_search.py [--words 50000] [--repeat 200] [--budget-ms 5]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.repository import InMemoryRepository
+from core.vocab_search import VocabSearchIndex
+
+SYLLABLES = ["ma", "lé", "ve", "ro", "chè", "ni", "pa", "tou", "gé", "rê", "sa", "bo", "fi", "ça", "dé", "lu",
+             "mo", "ré", "ta", "qui", "ê", "on", "ain", "eau", "ier", "ette", "oir", "ment"]
+ENGLISH_SYLLABLES = ["hou", "se", "ri", "ver", "win", "dow", "bre", "ad", "fri", "end", "ci", "ty", "li", "ght",
+                     "stu", "dent", "wa", "ter", "gar", "den", "ta", "ble", "mo", "ther"]
+
+
+def make_rows(count: int, seed: int = 7):
+    """Unique pseudo-French words, each with two meanings drawn from a pool of pseudo-English words"""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    meanings = sorted({"".join(rng.choice(ENGLISH_SYLLABLES) for _ in range(rng.randint(2, 3)))
+                       for _ in range(count // 10)})
+    return [{'word': word, 'meaning': f"{rng.choice(meanings)}, to {rng.choice(meanings)}",
+             'added_on': '', 'conjugation': None} for word in sorted(words)]
+
+
+def unaccent(word: str) -> str:
+    return word.translate(str.maketrans("éèêçà", "eeeca"))
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    i = rng.randrange(1, len(word))
+    return word[:i] + word[i + 1:] if rng.random() < 0.5 else word[:i] + rng.choice("aeiou") + word[i:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=50000, help="number of indexed words")
+    parser.add_argument("--repeat", type=int, default=200, help="queries per query type")
+    parser.add_argument("--budget-ms", type=float, default=5, help="fail if a query type's mean is slower")
+    args = parser.parse_args()
+
+    repo = InMemoryRepository()
+    for row in make_rows(args.words):
+        repo.add_word(row['word'], row['meaning'])
+    rows = repo.get_all_saved_words(include_conjugation=False)
+    start = time.perf_counter()
+    index = VocabSearchIndex(rows)
+    print(f"Indexed {len(index)} words in {time.perf_counter() - start:.2f} s\n")
+
+    rng = random.Random(11)
+    sample = [row['word'] for row in rng.sample(rows, args.repeat)]
+    queries = {
+        "exact": sample,
+        "prefix": [word[:3] for word in sample],
+        "unaccented": [unaccent(word) for word in sample],
+        "meaning": [row['meaning'].split(",")[0] for row in rng.sample(rows, args.repeat)],
+        "misspelled": [misspell(word, rng) for word in sample],
+    }
+
+    failures = []
+    print(f"{'query type':<12} {'mean ms':>8} {'p95 ms':>8} {'found %':>8}")
+    for name, terms in queries.items():
+        timings, found = [], 0
+        for term, target in zip(terms, sample):
+            start = time.perf_counter()
+            results = index.search(term)
+            timings.append((time.perf_counter() - start) * 1000)
+            if name in ("prefix", "meaning"):
+                found += bool(results)
+            else:
+                found += any(row['word'] == target for row in results)
+        timings.sort()
+        mean = sum(timings) / len(timings)
+        print(f"{name:<12} {mean:>8.2f} {timings[int(len(timings) * 0.95)]:>8.2f} {100 * found / len(terms):>7.0f}%")
+        if mean > args.budget_ms:
+            failures.append(f"{name} queries average {mean:.2f} ms (budget {args.budget_ms} ms)")
+
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,24 @@ from pathlib import Path
 
 
 DB_TIMEOUT = 10 
+SQLITE_POOL_SIZE = 4  # warm connections kept per database file
+SQLITE_STATEMENT_CACHE = 128  # compiled statements reused per connection
+# Applied to every pooled connection when it is opened
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",  # safe with WAL; fsync only at checkpoints
+    "cache_size": -16000,  # 16 MB page cache
+    "mmap_size": 268435456,  # 256 MB memory-mapped reads
+    "temp_store": "MEMORY",
+}
 BASE_DIR = Path(__file__).parent.parent
 DB_PATH = BASE_DIR / "data" / "french_learner.db"
+# Single-video transcript files from before the transcript library; imported into
+# it once by the add_transcript_library migration
 TRANSCRIPT_EN = BASE_DIR / "data" / "english_transcript.txt"
 TRANSCRIPT_FR = BASE_DIR / "data" / "french_transcript.txt"
-TRANSCRIPT_YOUTUBE = BASE_DIR / "data" / "youtube_transcript.txt"
 LINK_YOUTUBE = BASE_DIR / "data" / "youtube_link.txt"
+TRANSCRIPT_YOUTUBE = BASE_DIR / "data" / "youtube_transcript.txt"  # raw transcript of the last fetched video
 
 # UI Configuration
 COLOR_SCHEME = {
@@ -24,5 +36,59 @@ GROQ_MODEL = "llama-3.3-70b-versatile"
 GROQ_TRANSCRIPT_MODEL = "meta-llama/llama-4-maverick-17b-128e-instruct"
 GROQ_EVAL_MODEL = "meta-llama/llama-4-maverick-17b-128e-instruct"
 
+# Transcript ingestion (core/ingestion.py)
+TRANSCRIPT_CHUNK_CHARS = 4000  # transcript characters per LLM call, keeps each response under max_tokens
+TRANSCRIPT_CHUNK_OVERLAP = 3  # snippets repeated at the start of the next chunk
+TRANSCRIPT_WORKERS = 4  # concurrent LLM calls per ingestion
+TRANSLATION_BATCH_SIZE = 25  # French sentences per translation call
+TRANSLATION_RETRIES = 1  # extra attempts for a misaligned batch before translating it sentence by sentence
+
+# Transcript library (core/transcript_processing.py)
+TRANSCRIPT_PAGE_SIZE = 200  # sentence pairs read per query
+TRANSCRIPT_PAGE_CACHE = 32  # pages kept in memory per server
+
 VOSK_MODEL_PATH = BASE_DIR / "models" / "vosk-model-small-fr-0.22/" 
+VOSK_SAMPLE_RATE = 16000  # recordings are resampled to this rate before recognition
+VOSK_CHUNK_FRAMES = 4000  # audio frames fed to the recognizer per call
+
+# Speech recognition engine: "google" (online) or "vosk" (offline, uses VOSK_MODEL_PATH)
+SPEECH_ENGINE = "google"
+
+# Words per page in the vocabulary table
+VOCAB_PAGE_SIZE = 50
+
+# Vocabulary search (core/vocab_search.py)
+SEARCH_RESULT_LIMIT = 200  # most results shown for one query
+SEARCH_FUZZY_CANDIDATES = 200  # words re-ranked by trigram similarity
+SEARCH_FUZZY_THRESHOLD = 0.45  # minimum Dice similarity for a typo match
+
+# Storage backend used by every page: "auto" (Supabase, falling back to SQLite when
+# the probe fails), "supabase", "sqlite" or "memory" (process-local, for benchmarks)
+STORAGE_BACKEND = "auto"
+
+# Rows per request when paging through Supabase tables (PostgREST caps responses at 1000 by default)
+SUPABASE_PAGE_SIZE = 1000
+
+# Seconds a Supabase liveness probe result is reused before checking again
+SUPABASE_PROBE_TTL = 60
+
+# Background work (post-evaluation saving, prefetching)
+BACKGROUND_WORKERS = 4
+BACKGROUND_POLL_INTERVAL = 1  # seconds between UI checks on pending background jobs
+
+# Text-to-speech cache
+AUDIO_CACHE_DIR = BASE_DIR / "data" / "audio_cache"
+AUDIO_CACHE_MAX_BYTES = 200 * 1024 * 1024  # on-disk clips, LRU evicted beyond this
+AUDIO_HOT_CACHE_MAX_BYTES = 8 * 1024 * 1024  # most recent clips kept in memory
+# "inline": embed clips as audio/mpeg base64 data URIs (works in every browser)
+# "static": serve them by URL from static/audio. Opt-in: needs server.enableStaticServing
+# and a reverse proxy that sends .mp3 as audio/mpeg, since Streamlit's static handler
+# sends them as text/plain with nosniff, which iOS Safari refuses to play
+AUDIO_SERVING_MODE = "inline"
+STATIC_AUDIO_DIR = BASE_DIR / "static" / "audio"
+
+# LLM response cache
+LLM_CACHE_PATH = BASE_DIR / "data" / "llm_cache.db"
+LLM_CACHE_TTL = 60 * 60 * 24 * 30  # seconds, 30 days
+LLM_CACHE_MAX_ENTRIES = 5000
 
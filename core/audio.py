@@ -1,18 +1,68 @@
 import base64
-from gtts import gTTS
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import io
-import base64
-from IPython.display import Audio
 import streamlit as st
+from config.settings import AUDIO_CACHE_MAX_BYTES, AUDIO_SERVING_MODE, STATIC_AUDIO_DIR
+from core.audio_cache import AudioCache, prune_directory
+
+audio_cache = AudioCache()
+
+
+def synthesize_speech(text, lang='fr', slow=False):
+    """Return MP3 bytes for text, generating them with gTTS only on a cache miss"""
+    def generate():
+        from gtts import gTTS
+        tts = gTTS(text=text, lang=lang, slow=slow)
+        audio_bytes = io.BytesIO()
+        tts.write_to_fp(audio_bytes)
+        return audio_bytes.getvalue()
+
+    return audio_cache.get_or_create(text, lang, slow, generate)
+
+
+def prerender_audio(texts, lang='fr', workers=4):
+    """Synthesize and cache audio for every text not already cached; returns the number generated"""
+    pending = [text for text in dict.fromkeys(texts) if text and (text, lang, False) not in audio_cache]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda text: synthesize_speech(text, lang), pending)
+        for text, _ in zip(pending, results):
+            print(f"Cached audio: {text[:60]}")
+    return len(pending)
+
+
+def publish_audio(audio_bytes):
+    """
+    Write a clip once to static/audio/<content hash>.mp3 and return its URL, or None
+    unless AUDIO_SERVING_MODE is "static" and static serving is enabled. The ?v= query
+    makes the static handler send long-lived cache headers, which is safe because the
+    path changes with the content.
+    """
+    if AUDIO_SERVING_MODE != "static" or not st.get_option("server.enableStaticServing"):
+        return None
+    digest = hashlib.sha256(audio_bytes).hexdigest()[:32]
+    path = STATIC_AUDIO_DIR / f"{digest}.mp3"
+    try:
+        if not path.exists():
+            STATIC_AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(audio_bytes)
+            os.replace(tmp_path, path)
+            prune_directory(STATIC_AUDIO_DIR, AUDIO_CACHE_MAX_BYTES)
+        else:
+            os.utime(path)  # mark as recently used
+    except OSError as e:
+        print(f"Couldn't publish audio: {e}")
+        return None
+    return f"app/static/audio/{digest}.mp3?v={digest}"
+
 
 def play_audio(text, lang='fr'):
     """Generate and play audio for given text"""
     try:
-        tts = gTTS(text=text, lang=lang, slow=False)
-        audio_bytes = io.BytesIO()
-        tts.write_to_fp(audio_bytes)
-        audio_bytes.seek(0)
-        st.audio(audio_bytes, format='audio/mp3')
+        st.audio(synthesize_speech(text, lang), format='audio/mp3')
     except Exception as e:
         st.error(f"Couldn't generate audio: {e}")        
         
@@ -23,19 +73,17 @@ def play_audio_mobile_compatible(text, lang='fr'):
     
     try:
         # Generate TTS audio
-        tts = gTTS(text=text, lang=lang, slow=False)
-        audio_bytes = io.BytesIO()
-        tts.write_to_fp(audio_bytes)
-        audio_bytes.seek(0)
+        audio_bytes = synthesize_speech(text, lang)
         
-        # Convert to base64 for better mobile compatibility
-        audio_base64 = base64.b64encode(audio_bytes.read()).decode()
+        # Inline audio/mpeg data URI by default; a URL only when static serving is opted into
+        audio_src = publish_audio(audio_bytes)
+        if audio_src is None:
+            audio_src = f"data:audio/mpeg;base64,{base64.b64encode(audio_bytes).decode()}"
         
         # Create custom HTML audio player with better mobile support and configurable playback rate
         audio_html = f"""
         <audio controls autoplay style="width: 100%; margin: 10px 0;" playbackRate="{PLAYBACK_SPEED}">
-            <source src="data:audio/mp3;base64,{audio_base64}" type="audio/mpeg">
-            <source src="data:audio/wav;base64,{audio_base64}" type="audio/wav">
+            <source src="{audio_src}" type="audio/mpeg">
             Your browser does not support the audio element.
         </audio>
         <script>
@@ -108,3 +156,15 @@ def record_audio(duration=5, sample_rate=44100, chunk_size=1024):
         st.error(f"Error recording audio: {e}")
         return None
 
+
+if __name__ == "__main__":
+    # Bulk pre-render: python -m core.audio [--local]
+    import sys
+    from core.resources import get_repository, get_transcript_manager
+
+    repo = get_repository("sqlite" if "--local" in sys.argv else None)
+    words = [row['word'] for row in repo.get_all_saved_words()]
+    sentences = [french for _, french in get_transcript_manager().iter_pairs()]
+
+    count = prerender_audio(words + sentences)
+    print(f"Generated {count} new clips for {len(words)} words and {len(sentences)} sentences")
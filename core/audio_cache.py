@@ -0,0 +1,127 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+from config.settings import AUDIO_CACHE_DIR, AUDIO_CACHE_MAX_BYTES, AUDIO_HOT_CACHE_MAX_BYTES
+
+
+def prune_directory(directory: Path, max_bytes: int, suffix: str = ".mp3") -> Tuple[List[str], int]:
+    """
+    Delete the least recently modified files in `directory` until their total size
+    fits in max_bytes. Returns the stems of the removed files and the remaining size.
+    """
+    entries = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith(suffix)),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    total = sum(entry.stat().st_size for entry in entries)
+    removed = []
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        size = entry.stat().st_size
+        try:
+            os.remove(entry.path)
+        except OSError:
+            continue
+        total -= size
+        removed.append(entry.name[:-len(suffix)])
+    return removed, total
+
+
+class AudioCache:
+    """
+    Two-tier cache for synthesized speech, keyed on (text, lang, slow).
+
+    Clips are stored on disk as <sha256>.mp3 and evicted least-recently-used once
+    the directory exceeds `max_bytes` (file mtime is refreshed on every read).
+    A small in-memory tier bounded by `hot_max_bytes` serves the most recent clips
+    without touching disk.
+    """
+
+    def __init__(self, cache_dir: Path = AUDIO_CACHE_DIR, max_bytes: int = AUDIO_CACHE_MAX_BYTES,
+                 hot_max_bytes: int = AUDIO_HOT_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hot_max_bytes = hot_max_bytes
+        self._lock = threading.Lock()
+        self._hot = OrderedDict()
+        self._hot_bytes = 0
+        self._disk_bytes = sum(entry.stat().st_size for entry in os.scandir(self.cache_dir)
+                               if entry.name.endswith(".mp3"))
+
+    @staticmethod
+    def make_key(text: str, lang: str, slow: bool) -> str:
+        payload = f"{lang}\x00{int(slow)}\x00{text}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.mp3"
+
+    def get(self, text: str, lang: str = 'fr', slow: bool = False) -> Optional[bytes]:
+        """Return the cached clip, or None on a miss"""
+        key = self.make_key(text, lang, slow)
+        with self._lock:
+            if key in self._hot:
+                self._hot.move_to_end(key)
+                return self._hot[key]
+        path = self.path_for(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # mark as recently used
+        except OSError:
+            return None
+        with self._lock:
+            self._remember(key, data)
+        return data
+
+    def put(self, text: str, lang: str, slow: bool, data: bytes):
+        key = self.make_key(text, lang, slow)
+        path = self.path_for(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            existed = path.exists()
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Audio cache write error: {e}")
+            return
+        with self._lock:
+            if not existed:
+                self._disk_bytes += len(data)
+            self._remember(key, data)
+            if self._disk_bytes > self.max_bytes:
+                self._evict_disk()
+
+    def get_or_create(self, text: str, lang: str, slow: bool, synthesize: Callable[[], bytes]) -> bytes:
+        data = self.get(text, lang, slow)
+        if data is None:
+            data = synthesize()
+            self.put(text, lang, slow, data)
+        return data
+
+    def __contains__(self, item) -> bool:
+        key = self.make_key(*item)
+        return key in self._hot or self.path_for(key).exists()
+
+    def _remember(self, key: str, data: bytes):
+        """Add a clip to the hot tier, dropping the oldest ones beyond hot_max_bytes"""
+        if key in self._hot:
+            self._hot.move_to_end(key)
+            return
+        self._hot[key] = data
+        self._hot_bytes += len(data)
+        while self._hot_bytes > self.hot_max_bytes and len(self._hot) > 1:
+            _, old = self._hot.popitem(last=False)
+            self._hot_bytes -= len(old)
+
+    def _evict_disk(self):
+        """Delete least recently used clips until the directory fits in max_bytes"""
+        removed, self._disk_bytes = prune_directory(self.cache_dir, self.max_bytes)
+        for key in removed:
+            data = self._hot.pop(key, None)
+            if data is not None:
+                self._hot_bytes -= len(data)
@@ -0,0 +1,12 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+from config.settings import BACKGROUND_WORKERS
+
+# One pool per server process, shared by all sessions. Jobs must not call st.* -
+# they run outside the script thread; return results and render them on a later rerun.
+_executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix="background")
+
+
+def submit(fn: Callable, *args, **kwargs) -> Future:
+    """Run fn(*args, **kwargs) on the shared background pool"""
+    return _executor.submit(fn, *args, **kwargs)
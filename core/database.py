@@ -2,179 +2,272 @@ import sqlite3
 from typing import List, Tuple, Optional
 from pathlib import Path
 from datetime import datetime
-import pandas as pd
-from config.settings import DB_PATH, DB_TIMEOUT
-import streamlit as st
-from core.llm_utils import LLMUtils
+from config.settings import DB_PATH
+from core.resources import get_llm_utils
+from core.db_pool import get_pool
+from core.migrations import run_migrations
 
-llm_utils = LLMUtils()
+# sqlite3 errors propagate to the caller: these functions also run in background
+# jobs, which must not call st.*, so the page that made the call reports them.
 
 
 
 def init_db(db_path: Path):
+    """Create or upgrade the schema (see core.migrations)"""
     try:
-        with sqlite3.connect(db_path, timeout=10) as conn:
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS missing_words (
-                    word TEXT PRIMARY KEY,
-                    meaning TEXT,
-                    added_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS translation_scores (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    sentence TEXT,
-                    user_translation TEXT,
-                    score INTEGER,
-                    checked_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+        with get_pool(db_path).connection() as conn:
+            run_migrations(conn)
     except sqlite3.Error as e:
         raise Exception(f"Database initialization error: {e}")
     
 
-def save_missing_words(words: list):
-    try:
-        with sqlite3.connect(DB_PATH, timeout=DB_TIMEOUT) as conn:
-            for word in words:
-                if len(word.strip()) <= 3:
-                    continue
-                existing = conn.execute("SELECT 1 FROM missing_words WHERE word = ?", (word,)).fetchone()
-                if not existing:
-                    #correct the accents in the word
-                    #word = llm_utils.correct_french_accents(word.strip())
-                    #Get the meaning of the word using LLM
-                    meaning = llm_utils.get_french_word_meaning(word)
-                    conn.execute("INSERT INTO missing_words (word, meaning) VALUES (?, ?)", (word, meaning))
-            conn.commit()
-    except sqlite3.Error as e:
-        st.error(f"Error saving words: {e}")
-        
-        
+
+def save_missing_words(words: list) -> List[str]:
+    """Save new words with their meanings; returns the words that were added"""
+    # De-duplicate while keeping order and skip short words
+    candidates = list(dict.fromkeys(word.strip() for word in words if len(word.strip()) > 3))
+    if not candidates:
+        return []
+    with get_pool(DB_PATH).connection() as conn:
+        placeholders = ",".join("?" * len(candidates))
+        existing = {
+            row[0] for row in
+            conn.execute(f"SELECT word FROM missing_words WHERE word IN ({placeholders})", candidates)
+        }
+    new_words = [word for word in candidates if word not in existing]
+    if not new_words:
+        return []
+
+    # Get the meanings of all new words in one LLM call
+    meanings = get_llm_utils().get_french_word_meanings(new_words)
+    with get_pool(DB_PATH).connection() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO missing_words (word, meaning) VALUES (?, ?)",
+            [(word, meanings.get(word, "")) for word in new_words]
+        )
+    return new_words
+
 
 def save_score(sentence, user_translation, score):
-    try:
-        with sqlite3.connect(DB_PATH, timeout=DB_TIMEOUT) as conn:
-            conn.execute(
-                "INSERT INTO translation_scores (sentence, user_translation, score) VALUES (?, ?, ?)",
-                (sentence, user_translation, score)
-            )
-            conn.commit()
-    except sqlite3.Error as e:
-        st.error(f"Error saving score: {e}")
-        
+    with get_pool(DB_PATH).connection() as conn:
+        conn.execute(
+            "INSERT INTO translation_scores (sentence, user_translation, score) VALUES (?, ?, ?)",
+            (sentence, user_translation, score)
+        )
+
+
+def save_conjugation(word, conjugation):
+    """Store the conjugation details alongside an existing word"""
+    with get_pool(DB_PATH).connection() as conn:
+        conn.execute("UPDATE missing_words SET conjugation = ? WHERE word = ?", (conjugation, word))
+
+
+def get_all_saved_words(include_conjugation=False):
+    """Return (word, meaning, added_on) rows, plus conjugation when requested"""
+    columns = "word, meaning, added_on, conjugation" if include_conjugation else "word, meaning, added_on"
+    with get_pool(DB_PATH).connection() as conn:
+        rows = conn.execute(f"SELECT {columns} FROM missing_words ORDER BY added_on DESC, rowid DESC").fetchall()
+    return rows
+
+
+def get_saved_words_page(offset, limit):
+    """One page of (word, meaning, added_on, conjugation) rows, newest first"""
+    with get_pool(DB_PATH).connection() as conn:
+        # rowid breaks ties in added_on and is part of the added_on index, so no sort is needed
+        return conn.execute(
+            "SELECT word, meaning, added_on, conjugation FROM missing_words "
+            "ORDER BY added_on DESC, rowid DESC LIMIT ? OFFSET ?",
+            (limit, offset)
+        ).fetchall()
+
+
+def get_vocab_version():
+    """Change marker for the word list: (word count, newest added_on)"""
+    with get_pool(DB_PATH).connection() as conn:
+        return conn.execute("SELECT COUNT(*), MAX(added_on) FROM missing_words").fetchone()
+
+
+def word_exists(word) -> bool:
+    with get_pool(DB_PATH).connection() as conn:
+        return conn.execute("SELECT 1 FROM missing_words WHERE word = ?", (word,)).fetchone() is not None
+
+
+def add_word(word, meaning) -> bool:
+    """Insert a single word; returns False if it already existed"""
+    with get_pool(DB_PATH).connection() as conn:
+        cursor = conn.execute("INSERT OR IGNORE INTO missing_words (word, meaning) VALUES (?, ?)", (word, meaning))
+    return cursor.rowcount > 0
+
+
+def count_saved_words() -> int:
+    with get_pool(DB_PATH).connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM missing_words").fetchone()[0]
 
-def get_all_saved_words():
-    try:
-        with sqlite3.connect(DB_PATH, timeout=DB_TIMEOUT) as conn:
-            rows = conn.execute("SELECT word, meaning, added_on FROM missing_words ORDER BY added_on DESC").fetchall()
-        return rows
-    except sqlite3.Error as e:
-        st.error(f"Error fetching words: {e}")
-        return []
 
-        
 def delete_saved_word(word):
-    try:
-        with sqlite3.connect(DB_PATH, timeout=DB_TIMEOUT) as conn:
-            conn.execute("DELETE FROM missing_words WHERE word = ?", (word,))
-            conn.commit()
-    except sqlite3.Error as e:
-        st.error(f"Error deleting word: {e}")
-        
-        
+    with get_pool(DB_PATH).connection() as conn:
+        conn.execute("DELETE FROM missing_words WHERE word = ?", (word,))
+
+
+def delete_saved_words(words):
+    """Delete several words in one statement"""
+    words = list(words)
+    if not words:
+        return
+    with get_pool(DB_PATH).connection() as conn:
+        placeholders = ",".join("?" * len(words))
+        conn.execute(f"DELETE FROM missing_words WHERE word IN ({placeholders})", words)
+
+
 def get_score_history():
     """Get all score history"""
-    try:
-        with sqlite3.connect(DB_PATH, timeout=DB_TIMEOUT) as conn:
-            query = """
-                SELECT 
-                    id,
-                    sentence,
-                    user_translation,
-                    score,
-                    checked_on
-                FROM translation_scores 
-                ORDER BY checked_on ASC
-            """
-            df = pd.read_sql_query(query, conn)
-             # Ensure consistent column naming
-            if not df.empty and 'score' in df.columns:
-                df = df.rename(columns={'score': 'Score'})
-            
-        return df
-    except sqlite3.Error as e:
-        st.error(f"Error fetching score history: {e}")
-        return pd.DataFrame()
+    import pandas as pd
+    with get_pool(DB_PATH).connection() as conn:
+        query = """
+            SELECT 
+                id,
+                sentence,
+                user_translation,
+                score,
+                checked_on
+            FROM translation_scores 
+            ORDER BY checked_on ASC
+        """
+        df = pd.read_sql_query(query, conn)
+        # Ensure consistent column naming
+        if not df.empty and 'score' in df.columns:
+            df = df.rename(columns={'score': 'Score'})
+        
+    return df
+
+
+def get_score_version():
+    """
+    Cheap change marker for the score history: (attempt count, last id, last checked_on).
+    The count is summed over the per-day totals and the other two are index lookups,
+    so a deleted attempt changes the marker without scanning every row.
+    """
+    with get_pool(DB_PATH).connection() as conn:
+        return conn.execute(
+            "SELECT (SELECT COALESCE(SUM(attempt_count), 0) FROM daily_scores), MAX(id), MAX(checked_on) "
+            "FROM translation_scores"
+        ).fetchone()
+
 
 def get_daily_scores():
-    """Get average scores grouped by day"""
-    try:
-        with sqlite3.connect(DB_PATH, timeout=DB_TIMEOUT) as conn:
-            query = """
-                SELECT 
-                    DATE(checked_on) as date,
-                    COUNT(*) as attempt_count,
-                    AVG(score) as avg_score,
-                    MIN(score) as min_score,
-                    MAX(score) as max_score
-                FROM translation_scores 
-                GROUP BY DATE(checked_on)
-                ORDER BY date DESC
-            """
-            df = pd.read_sql_query(query, conn)
-        return df
-    except sqlite3.Error as e:
-        st.error(f"Error fetching daily scores: {e}")
-        return pd.DataFrame()
+    """Get average scores grouped by day (from the trigger-maintained daily_scores table)"""
+    import pandas as pd
+    with get_pool(DB_PATH).connection() as conn:
+        query = """
+            SELECT 
+                day as date,
+                attempt_count,
+                CAST(score_sum AS REAL) / attempt_count as avg_score,
+                min_score,
+                max_score
+            FROM daily_scores 
+            ORDER BY day DESC
+        """
+        df = pd.read_sql_query(query, conn)
+    return df
+
 
 def get_weekly_progress():
-    """Get weekly progress data"""
-    try:
-        with sqlite3.connect(DB_PATH, timeout=DB_TIMEOUT) as conn:
-            query = """
-                SELECT 
-                    STRFTIME('%Y-%W', checked_on) as week,
-                    MIN(DATE(checked_on, 'weekday 0', '-7 days')) as week_start,
-                    COUNT(*) as attempt_count,
-                    AVG(score) as avg_score,
-                    MIN(score) as min_score,
-                    MAX(score) as max_score
-                FROM translation_scores 
-                GROUP BY STRFTIME('%Y-%W', checked_on)
-                ORDER BY week_start DESC
-            """
-            df = pd.read_sql_query(query, conn)
-        return df
-    except sqlite3.Error as e:
-        st.error(f"Error fetching weekly progress: {e}")
-        return pd.DataFrame()
+    """Get weekly progress data (from the trigger-maintained weekly_scores table)"""
+    import pandas as pd
+    with get_pool(DB_PATH).connection() as conn:
+        query = """
+            SELECT 
+                week,
+                week_start,
+                attempt_count,
+                CAST(score_sum AS REAL) / attempt_count as avg_score,
+                min_score,
+                max_score
+            FROM weekly_scores 
+            ORDER BY week_start DESC
+        """
+        df = pd.read_sql_query(query, conn)
+    return df
+
 
 def get_score_statistics():
-    """Get overall score statistics"""
-    try:
-        with sqlite3.connect(DB_PATH, timeout=DB_TIMEOUT) as conn:
-            query = """
-                SELECT 
-                    COUNT(*) as total_attempts,
-                    AVG(score) as overall_avg,
-                    MIN(score) as min_score,
-                    MAX(score) as max_score,
-                    COUNT(DISTINCT DATE(checked_on)) as days_active
-                FROM translation_scores
-            """
-            result = conn.execute(query).fetchone()
-            stats = {
-                'total_attempts': result[0],
-                'overall_avg': round(result[1], 2) if result[1] else 0,
-                'min_score': result[2] or 0,
-                'max_score': result[3] or 0,
-                'days_active': result[4] or 0
-            }
-        return stats
-    except sqlite3.Error as e:
-        st.error(f"Error fetching score statistics: {e}")
-        return {}
-        
+    """Get overall score statistics, summed over the per-day totals"""
+    with get_pool(DB_PATH).connection() as conn:
+        query = """
+            SELECT 
+                COALESCE(SUM(attempt_count), 0) as total_attempts,
+                CAST(SUM(score_sum) AS REAL) / SUM(attempt_count) as overall_avg,
+                MIN(min_score) as min_score,
+                MAX(max_score) as max_score,
+                COUNT(*) as days_active
+            FROM daily_scores
+        """
+        result = conn.execute(query).fetchone()
+        stats = {
+            'total_attempts': result[0],
+            'overall_avg': round(result[1], 2) if result[1] else 0,
+            'min_score': result[2] or 0,
+            'max_score': result[3] or 0,
+            'days_active': result[4] or 0
+        }
+    return stats
+
+
+# Transcript library
+
+def save_transcript_video(video_id, url):
+    with get_pool(DB_PATH).connection() as conn:
+        conn.execute(
+            "INSERT INTO transcript_videos (video_id, url) VALUES (?, ?) "
+            "ON CONFLICT (video_id) DO UPDATE SET url = excluded.url",
+            (video_id, url)
+        )
+
+
+def save_transcript_pairs(video_id, start, french, english):
+    """Store pairs at indexes start, start + 1, ...; rows whose content hash is unchanged are left alone"""
+    from core.ingestion import pair_hash
+    rows = [(video_id, start + i, pair_hash(fr, en), fr, en) for i, (fr, en) in enumerate(zip(french, english))]
+    with get_pool(DB_PATH).connection() as conn:
+        conn.executemany(
+            "INSERT INTO transcript_sentences (video_id, idx, hash, french, english) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (video_id, idx) DO UPDATE SET "
+            "hash = excluded.hash, french = excluded.french, english = excluded.english "
+            "WHERE hash != excluded.hash",
+            rows
+        )
+
+
+def trim_transcript(video_id, count) -> int:
+    """Drop a video's pairs from index `count` on; returns the number removed"""
+    with get_pool(DB_PATH).connection() as conn:
+        cursor = conn.execute("DELETE FROM transcript_sentences WHERE video_id = ? AND idx >= ?", (video_id, count))
+    return cursor.rowcount
+
+
+def delete_transcript_video(video_id):
+    with get_pool(DB_PATH).connection() as conn:
+        conn.execute("DELETE FROM transcript_sentences WHERE video_id = ?", (video_id,))
+        conn.execute("DELETE FROM transcript_videos WHERE video_id = ?", (video_id,))
+
+
+def get_transcript_videos():
+    """(video_id, url, added_on, sentence_count) for every video with sentences, newest first"""
+    with get_pool(DB_PATH).connection() as conn:
+        return conn.execute('''
+            SELECT v.video_id, v.url, v.added_on, COUNT(s.idx) AS sentence_count
+            FROM transcript_videos v JOIN transcript_sentences s ON s.video_id = v.video_id
+            GROUP BY v.video_id
+            ORDER BY v.added_on DESC, v.video_id
+        ''').fetchall()
+
+
+def get_transcript_page(video_id, start, limit):
+    """(english, french) pairs of one video for indexes start .. start + limit - 1"""
+    with get_pool(DB_PATH).connection() as conn:
+        return conn.execute(
+            "SELECT english, french FROM transcript_sentences "
+            "WHERE video_id = ? AND idx >= ? AND idx < ? ORDER BY idx",
+            (video_id, start, start + limit)
+        ).fetchall()
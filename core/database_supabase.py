@@ -1,130 +1,229 @@
-from supabase import create_client, Client
 import os
-import pandas as pd
+import threading
 from datetime import datetime
 from dotenv import load_dotenv
-from core.llm_utils import LLMUtils
+from config.settings import SUPABASE_PAGE_SIZE
 load_dotenv()
 
+# Request errors propagate to the caller, as in core.database
+
+# Schema: besides the missing_words and translation_scores tables, run the scripts
+# in supabase/ once in the Supabase SQL editor: conjugation_column.sql (the column
+# read and written by the vocabulary pages) and score_aggregates.sql (the per-day
+# and per-week totals behind the score RPCs)
+
+# Columns the progress charts need; sentences and translations stay on the server
+SCORE_HISTORY_COLUMNS = ['id', 'score', 'checked_on']
+
+
+def _quote(value) -> str:
+    """Double-quote a value for a PostgREST filter, so commas and parentheses are literal"""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
 class SupabaseDB:
-    def __init__(self):
+    def __init__(self, llm_utils=None):
+        from supabase import create_client
         url = os.getenv('SUPABASE_URL')
         key = os.getenv('SUPABASE_API_KEY')
         self.supabase = create_client(url, key)
-        self.llm_utils =  LLMUtils()
+        if llm_utils is None:
+            from core.resources import get_llm_utils
+            llm_utils = get_llm_utils()
+        self.llm_utils = llm_utils
+        # Local copy of the score history, extended with only the rows newer than
+        # the last synced (checked_on, id) key on each get_score_history call
+        self._history = []
+        self._history_key = None
+        self._history_lock = threading.Lock()
+
+    def ping(self):
+        """Cheap liveness probe: fetch at most one row, raising if Supabase is unreachable"""
+        self.supabase.table('missing_words').select('word').limit(1).execute()
+        return True
 
     def save_missing_words(self, words):
-        """Save missing words with meanings"""
-        try:
-            for word in words:
-                if len(word.strip()) <= 3:
-                    continue
-                
-                # Check if word already exists
-                existing = self.supabase.table('missing_words').select('word').eq('word', word).execute()
-                
-                if not existing.data:
-                    # Get meaning using LLM utility
-                    meaning = self.llm_utils.get_french_word_meaning(word)
-                    
-                    # Insert word with error handling
-                    try:
-                        response = self.supabase.table('missing_words').insert({
-                            'word': word, 
-                            'meaning': meaning
-                        }).execute()
-                        
-                        # Check for errors in the response
-                        if hasattr(response, 'error') and response.error:
-                            print(f"Error inserting word {word}: {response.error}")
-                    
-                    except Exception as insert_error:
-                        print(f"Insertion error for word {word}: {insert_error}")
-    
-        except Exception as e:
-            print(f"Error in save_missing_words: {e}")
+        """Save missing words with meanings; returns the words that were added"""
+        # De-duplicate while keeping order and skip short words
+        candidates = list(dict.fromkeys(word.strip() for word in words if len(word.strip()) > 3))
+        if not candidates:
+            return []
+        # Check which words already exist with a single query
+        existing = self.supabase.table('missing_words').select('word').in_('word', candidates).execute()
+        existing_words = {row['word'] for row in existing.data}
+        new_words = [word for word in candidates if word not in existing_words]
+        if not new_words:
+            return []
+
+        # Get meanings for all new words in one LLM call
+        meanings = self.llm_utils.get_french_word_meanings(new_words)
+
+        # Bulk insert, ignoring words added concurrently since the existence check
+        self.supabase.table('missing_words').upsert(
+            [{'word': word, 'meaning': meanings.get(word, '')} for word in new_words],
+            on_conflict='word',
+            ignore_duplicates=True
+        ).execute()
+        return new_words
+
 
     def save_score(self, sentence, user_translation, score):
         """Save translation score"""
-        try:
-            self.supabase.table('translation_scores').insert({
-                'sentence': sentence,
-                'user_translation': user_translation,
-                'score': score
-            }).execute()
-        except Exception as e:
-            print(f"Error saving score: {e}")
-
-    def get_all_saved_words(self):
-        """Retrieve all saved words"""
-        try:
-            response = self.supabase.table('missing_words').select('*').order('added_on', desc=True).execute()
-            return response.data
-        except Exception as e:
-            print(f"Error fetching words: {e}")
-            return []
+        self.supabase.table('translation_scores').insert({
+            'sentence': sentence,
+            'user_translation': user_translation,
+            'score': score
+        }).execute()
+
+    def save_conjugation(self, word, conjugation):
+        """Store the conjugation details alongside an existing word"""
+        self.supabase.table('missing_words').update({
+            'conjugation': conjugation
+        }).eq('word', word).execute()
+
+    def get_all_saved_words(self, include_conjugation=False):
+        """
+        All saved words (word, meaning, added_on, plus conjugation when requested),
+        newest first. PostgREST caps each response, so the rows are fetched in
+        keyset pages of SUPABASE_PAGE_SIZE ordered by (added_on desc, word).
+        """
+        columns = "word,meaning,added_on,conjugation" if include_conjugation else "word,meaning,added_on"
+        rows = []
+        after = None
+        while True:
+            query = self.supabase.table('missing_words').select(columns)
+            if after is not None:
+                added_on, word = after
+                query = query.or_(f'added_on.lt.{_quote(added_on)},'
+                                  f'and(added_on.eq.{_quote(added_on)},word.gt.{_quote(word)})')
+            page = query.order('added_on', desc=True).order('word').limit(SUPABASE_PAGE_SIZE).execute().data
+            rows.extend(page)
+            if len(page) < SUPABASE_PAGE_SIZE:
+                return rows
+            after = (page[-1]['added_on'], page[-1]['word'])
+
+    def get_saved_words_page(self, offset, limit):
+        """One page of saved words, newest first"""
+        response = self.supabase.table('missing_words').select('*') \
+            .order('added_on', desc=True).order('word').range(offset, offset + limit - 1).execute()
+        return response.data
+
+    def get_vocab_version(self):
+        """Change marker for the word list: (word count, newest added_on)"""
+        response = self.supabase.table('missing_words').select('added_on', count='exact') \
+            .order('added_on', desc=True).limit(1).execute()
+        newest = response.data[0]['added_on'] if response.data else None
+        return (response.count, newest)
+
+    def word_exists(self, word):
+        response = self.supabase.table('missing_words').select('word').eq('word', word).execute()
+        return bool(response.data)
+
+    def add_word(self, word, meaning):
+        """Insert a single word; returns False if it already existed"""
+        response = self.supabase.table('missing_words').upsert(
+            {'word': word, 'meaning': meaning},
+            on_conflict='word',
+            ignore_duplicates=True
+        ).execute()
+        return bool(response.data)
+
+    def count_saved_words(self):
+        """Count words without downloading them"""
+        response = self.supabase.table('missing_words').select('word', count='exact', head=True).execute()
+        return response.count or 0
 
     def delete_saved_word(self, word):
         """Delete a saved word"""
-        try:
-            self.supabase.table('missing_words').delete().eq('word', word).execute()
-        except Exception as e:
-            print(f"Error deleting word: {e}")
+        self.supabase.table('missing_words').delete().eq('word', word).execute()
+
+    def delete_saved_words(self, words):
+        """Delete several words with one request"""
+        words = list(words)
+        if not words:
+            return
+        self.supabase.table('missing_words').delete().in_('word', words).execute()
+
+    def _fetch_scores_after(self, after):
+        """
+        Score rows ordered by (checked_on, id) that come strictly after the `after`
+        key (None for all rows), fetched in keyset pages of SUPABASE_PAGE_SIZE.
+        """
+        rows = []
+        while True:
+            query = self.supabase.table('translation_scores').select(','.join(SCORE_HISTORY_COLUMNS))
+            if after is not None:
+                checked_on, row_id = after
+                query = query.or_(f'checked_on.gt.{_quote(checked_on)},'
+                                  f'and(checked_on.eq.{_quote(checked_on)},id.gt.{row_id})')
+            page = query.order('checked_on').order('id').limit(SUPABASE_PAGE_SIZE).execute().data
+            rows.extend(page)
+            if len(page) < SUPABASE_PAGE_SIZE:
+                return rows
+            after = (page[-1]['checked_on'], page[-1]['id'])
 
     def get_score_history(self):
-        """Get all score history"""
-        try:
-            response = self.supabase.table('translation_scores').select('*').order('checked_on').execute()
-            return pd.DataFrame(response.data)
-        except Exception as e:
-            print(f"Error fetching score history: {e}")
-            return pd.DataFrame()
+        """
+        Score history (id, score, checked_on), oldest first. Only rows saved since
+        the previous call are downloaded, unless the attempt count in the per-day
+        totals shows that rows were deleted, in which case the whole history is
+        fetched again.
+        """
+        import pandas as pd
+        with self._history_lock:
+            new_rows = self._fetch_scores_after(self._history_key)
+            self._history.extend(new_rows)
+            total = self.get_score_statistics()['total_attempts']
+            if total != len(self._history):
+                self._history = self._fetch_scores_after(None)
+            if self._history:
+                self._history_key = (self._history[-1]['checked_on'], self._history[-1]['id'])
+            else:
+                self._history_key = None
+            return pd.DataFrame(self._history, columns=SCORE_HISTORY_COLUMNS)
+
+    def get_score_version(self):
+        """
+        Change marker for the score history: (attempt count, last id, last checked_on).
+        The count comes from the per-day totals and the rest from a one-row query,
+        so neither request scans translation_scores.
+        """
+        total = self.get_score_statistics()['total_attempts']
+        response = self.supabase.table('translation_scores').select('id, checked_on') \
+            .order('checked_on', desc=True).order('id', desc=True).limit(1).execute()
+        if response.data:
+            return (total, response.data[0]['id'], response.data[0]['checked_on'])
+        return (0, None, None)
 
     def get_daily_scores(self):
         """Get average scores grouped by day"""
-        try:
-            # Use the specific function we created
-            response = self.supabase.rpc('get_daily_scores').execute()
-            return pd.DataFrame(response.data)
-        except Exception as e:
-            print(f"Error fetching daily scores: {e}")
-            return pd.DataFrame()
+        import pandas as pd
+        # Use the specific function we created
+        response = self.supabase.rpc('get_daily_scores').execute()
+        return pd.DataFrame(response.data)
 
     def get_weekly_progress(self):
         """Get weekly progress data"""
-        try:
-            response = self.supabase.rpc('get_weekly_progress').execute()
-            return pd.DataFrame(response.data)
-        except Exception as e:
-            print(f"Error fetching weekly progress: {e}")
-            return pd.DataFrame()
+        import pandas as pd
+        response = self.supabase.rpc('get_weekly_progress').execute()
+        return pd.DataFrame(response.data)
 
     def get_score_statistics(self):
         """Get overall score statistics"""
-        try:
-            response = self.supabase.rpc('get_score_statistics').execute()
-            if response.data and len(response.data) > 0:
-                result = response.data[0]
-                return {
-                    'total_attempts': result.get('total_attempts', 0),
-                    'overall_avg': round(result.get('overall_avg', 0), 2) if result.get('overall_avg') else 0,
-                    'min_score': result.get('min_score', 0),
-                    'max_score': result.get('max_score', 0),
-                    'days_active': result.get('days_active', 0)
-                }
+        response = self.supabase.rpc('get_score_statistics').execute()
+        if response.data and len(response.data) > 0:
+            result = response.data[0]
             return {
-                'total_attempts': 0,
-                'overall_avg': 0,
-                'min_score': 0,
-                'max_score': 0,
-                'days_active': 0
+                'total_attempts': result.get('total_attempts', 0),
+                'overall_avg': round(result.get('overall_avg', 0), 2) if result.get('overall_avg') else 0,
+                'min_score': result.get('min_score', 0),
+                'max_score': result.get('max_score', 0),
+                'days_active': result.get('days_active', 0)
             }
-        except Exception as e:
-            print(f"Error fetching score statistics: {e}")
-            return {
-                'total_attempts': 0,
-                'overall_avg': 0,
-                'min_score': 0,
-                'max_score': 0,
-                'days_active': 0
-            }
\ No newline at end of file
+        return {
+            'total_attempts': 0,
+            'overall_avg': 0,
+            'min_score': 0,
+            'max_score': 0,
+            'days_active': 0
+        }
\ No newline at end of file
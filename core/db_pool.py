@@ -0,0 +1,94 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from config.settings import DB_TIMEOUT, SQLITE_POOL_SIZE, SQLITE_PRAGMAS, SQLITE_STATEMENT_CACHE
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of warm SQLite connections to one database file.
+
+    Connections are opened lazily (up to `size`), configured once with
+    SQLITE_PRAGMAS and then reused, so each one keeps its page cache, memory map
+    and compiled statements (up to SQLITE_STATEMENT_CACHE per connection)
+    across calls. Callers block for up to `timeout` seconds when all
+    connections are checked out.
+    """
+
+    def __init__(self, db_path: Path, size: int = SQLITE_POOL_SIZE, timeout: float = DB_TIMEOUT):
+        self.db_path = str(db_path)
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False,
+                               cached_statements=SQLITE_STATEMENT_CACHE)
+        for pragma, value in SQLITE_PRAGMAS.items():
+            conn.execute(f"PRAGMA {pragma}={value}")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_open = self._created < self.size
+            if can_open:
+                self._created += 1
+        if can_open:
+            try:
+                return self._open()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(f"No free connection to {self.db_path} after {self.timeout}s")
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a connection. The transaction is committed when the block exits
+        normally and rolled back if it raises; the connection then returns to the pool.
+        """
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        """Close the idle connections, e.g. before deleting the database file"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+def get_pool(db_path: Path) -> ConnectionPool:
+    """Return the process-wide pool for `db_path`, creating it on first use"""
+    key = str(Path(db_path).resolve())
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(db_path)
+        return pool
@@ -1,9 +1,28 @@
 from ast import literal_eval
-from core.llm_utils import LLMUtils
+import json
+from typing import Any, Dict
+from core.resources import get_llm_utils
 from config.settings import GROQ_MODEL, GROQ_TRANSCRIPT_MODEL, GROQ_EVAL_MODEL
 
 
-llm_utils = LLMUtils()
+# JSON schema for the combined evaluation response
+EVALUATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "correct": {"type": "string"},
+        "feedback": {"type": "string"},
+        "score": {"type": "integer", "minimum": 0, "maximum": 10},
+        "missed_words": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["correct", "feedback", "score", "missed_words"],
+    "additionalProperties": False
+}
+
+
+def format_feedback(feedback: str) -> str:
+    """Turn the feedback paragraph into one bullet per sentence"""
+    feedback_sentences = feedback.split(".")
+    return "\n".join([f"• {sentence}" for sentence in feedback_sentences if sentence])
 
 def check_translation(original: str, attempt: str, correct: str):
     prompt = f"""/no_think
@@ -30,7 +49,7 @@ User's French translation: "{attempt}"
 Correct French translation: "{correct}"
 
 """
-    response = llm_utils.groq_client.chat.completions.create(
+    response = get_llm_utils().groq_client.chat.completions.create(
             messages=[
              {"role": "user", "content": prompt}],
             model=GROQ_EVAL_MODEL )
@@ -42,13 +61,65 @@ Correct French translation: "{correct}"
     try:
         result = literal_eval(response)
         print(f"LLM Response: {result}")
-        feedback = result.get("feedback", "")
-        feedback_sentences = feedback.split(".")
-        feedback = "\n".join([f"• {sentence}" for sentence in feedback_sentences if sentence])
+        feedback = format_feedback(result.get("feedback", ""))
         # Get the first sentence of feedback
         score = result.get("score", 0)
     except Exception as e:
         feedback = "⚠️ Failed to parse LLM response."
         score = 0
         print(e)
-    return feedback, score
\ No newline at end of file
+    return feedback, score
+
+
+def evaluate_translation(original: str, attempt: str, correct: str) -> Dict[str, Any]:
+    """
+    Score a translation and find the words the user missed with a single LLM call.
+
+    Combines check_translation and LLMUtils.extract_missed_words into one
+    JSON-schema-constrained response.
+
+    Returns:
+        A dict with 'feedback' (bulleted), 'score' (int 0-10), 'correct' and
+        'missed_words' (base forms of the words missing from the attempt)
+    """
+    prompt = f"""/no_think
+You are a strict but fair French translation evaluator.
+
+Compare the user's translation to the correct one. Provide:
+1. "correct": the correct French translation.
+2. "feedback": precise feedback explaining errors committed. Each error should be a separate sentence.
+3. "score": a score from 0 to 10 (integer only), based on correctness of the user's translation compared to the English sentence.
+   While scoring, ignore any minor punctuation or accent errors, focus on the overall meaning and structure.
+4. "missed_words": the words (nouns, verbs, adjectives, adverbs) from the correct translation that are missing
+   in the user's translation, in their base form. Use an empty list if none are missing.
+
+Now evaluate:
+
+English sentence: "{original}"
+User's French translation: "{attempt}"
+Correct French translation: "{correct}"
+"""
+    try:
+        response = get_llm_utils().groq_client.chat.completions.create(
+            messages=[{"role": "user", "content": prompt}],
+            model=GROQ_EVAL_MODEL,
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": "translation_evaluation", "schema": EVALUATION_SCHEMA}
+            }
+        )
+        result = json.loads(response.choices[0].message.content)
+        return {
+            "feedback": format_feedback(result.get("feedback", "")),
+            "score": max(0, min(10, int(result.get("score", 0)))),
+            "correct": result.get("correct", correct),
+            "missed_words": [word for word in result.get("missed_words", []) if isinstance(word, str)]
+        }
+    except Exception as e:
+        print(e)
+        return {
+            "feedback": "⚠️ Failed to parse LLM response.",
+            "score": 0,
+            "correct": correct,
+            "missed_words": []
+        }
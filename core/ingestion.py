@@ -0,0 +1,359 @@
+import hashlib
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+from config.settings import (TRANSCRIPT_CHUNK_CHARS, TRANSCRIPT_CHUNK_OVERLAP, TRANSCRIPT_WORKERS,
+                             TRANSLATION_BATCH_SIZE, TRANSLATION_RETRIES)
+from core.database import save_transcript_video, save_transcript_pairs, trim_transcript
+from core.vocab_search import fold
+
+# Transcript ingestion: the raw YouTube transcript is split into chunks at snippet
+# boundaries, each chunk is turned into sentences by the LLM concurrently, and the
+# results are stitched back together in order. The sentences are then translated
+# in numbered batches, also concurrently, with every batch checked for alignment,
+# and stored in the transcript library under the video's id.
+
+NUMBERED_LINE = re.compile(r"^\s*(\d+)\s*[.)]\s+(.+?)\s*$")
+
+
+def parse_video_id(video_url: str) -> str:
+    """The video id from a youtube.com (watch, embed, v) or youtu.be URL"""
+    parsed_url = urlparse(video_url.strip())
+    video_id = None
+    if parsed_url.hostname in ['youtube.com', 'www.youtube.com', 'm.youtube.com']:
+        if parsed_url.path == '/watch':
+            video_id = parse_qs(parsed_url.query).get('v', [None])[0]
+        elif parsed_url.path.startswith(('/embed/', '/v/')):
+            video_id = parsed_url.path.split('/')[2]
+    elif parsed_url.hostname == 'youtu.be':
+        video_id = parsed_url.path[1:]  # Remove the leading slash
+    else:
+        raise ValueError("Invalid YouTube URL")
+
+    if not video_id:
+        raise ValueError("Could not extract video ID from URL")
+    return video_id
+
+
+def pair_hash(french: str, english: str) -> str:
+    """Content hash of a sentence pair, so re-ingesting a video only rewrites changed rows"""
+    return hashlib.sha1(f"{french}\n{english}".encode("utf-8")).hexdigest()[:16]
+
+
+def split_snippets(transcript: str, max_chars: int = TRANSCRIPT_CHUNK_CHARS) -> List[str]:
+    """
+    One snippet per transcript line. Transcripts saved before snippets were kept
+    on separate lines are a single long line, so overlong lines are cut at word
+    boundaries into pieces of at most max_chars // 8 characters.
+    """
+    piece_chars = max(1, max_chars // 8)
+    snippets = []
+    for line in transcript.splitlines():
+        line = line.strip()
+        if len(line) <= piece_chars:
+            if line:
+                snippets.append(line)
+            continue
+        piece = []
+        length = 0
+        for word in line.split():
+            if piece and length + len(word) + 1 > piece_chars:
+                snippets.append(" ".join(piece))
+                piece, length = [], 0
+            piece.append(word)
+            length += len(word) + 1
+        if piece:
+            snippets.append(" ".join(piece))
+    return snippets
+
+
+def chunk_snippets(snippets: List[str], max_chars: int = TRANSCRIPT_CHUNK_CHARS,
+                   overlap: int = TRANSCRIPT_CHUNK_OVERLAP) -> List[str]:
+    """
+    Group consecutive snippets into chunks of about max_chars characters. Each
+    chunk repeats the last `overlap` snippets of the previous one, so a sentence
+    cut by a chunk boundary appears whole in at least one chunk.
+    """
+    chunks = []
+    start = 0
+    while start < len(snippets):
+        end = start
+        length = 0
+        while end < len(snippets) and (end == start or length + len(snippets[end]) <= max_chars):
+            length += len(snippets[end]) + 1
+            end += 1
+        chunks.append("\n".join(snippets[start:end]))
+        if end >= len(snippets):
+            break
+        # Always advance, even when a chunk holds fewer snippets than the overlap
+        start = max(start + 1, end - overlap)
+    return chunks
+
+
+def parse_numbered_items(text: str) -> List[Tuple[int, str]]:
+    """(number, sentence) pairs from a '1. ...' numbered list, ignoring any other lines"""
+    items = []
+    for line in text.splitlines():
+        match = NUMBERED_LINE.match(line)
+        if match:
+            items.append((int(match.group(1)), match.group(2)))
+    return items
+
+
+def parse_numbered(text: str) -> List[str]:
+    """Sentences from a '1. ...' numbered list, ignoring any other lines"""
+    return [sentence for _, sentence in parse_numbered_items(text)]
+
+
+def format_numbered(sentences: List[str]) -> str:
+    return "\n".join(f"{number}. {sentence}" for number, sentence in enumerate(sentences, start=1))
+
+
+def _sentence_key(sentence: str) -> str:
+    """Accent, case and punctuation-insensitive form used to spot repeated sentences"""
+    return " ".join(re.findall(r"\w+", fold(sentence)))
+
+
+def _is_seam_duplicate(key: str, previous_keys: List[str]) -> bool:
+    """
+    Whether a sentence repeats one from the end of the previous chunk. The
+    overlap can be segmented differently on each side of the seam, so a sentence
+    contained in (or containing) an earlier one also counts.
+    """
+    for previous in previous_keys:
+        if key == previous:
+            return True
+        shorter, longer = sorted((key, previous), key=len)
+        if len(shorter) >= 12 and shorter in longer:
+            return True
+    return False
+
+
+def merge_chunk_sentences(chunk_sentences: List[List[str]], window: int = None) -> List[str]:
+    """
+    Concatenate per-chunk sentence lists in order, dropping sentences at the start
+    of each chunk that repeat the previous chunk's last `window` sentences.
+    """
+    if window is None:
+        window = max(3, TRANSCRIPT_CHUNK_OVERLAP * 2)
+    merged = []
+    previous_keys = []
+    for sentences in chunk_sentences:
+        kept = []
+        for position, sentence in enumerate(sentences):
+            key = _sentence_key(sentence)
+            if not key:
+                continue
+            if position < window and _is_seam_duplicate(key, previous_keys):
+                continue
+            kept.append(sentence)
+        merged.extend(kept)
+        previous_keys = [_sentence_key(sentence) for sentence in sentences[-window:]]
+    return merged
+
+
+def _extract_chunk(llm_utils, chunk: str, attempts: int = 2) -> List[str]:
+    """French sentences for one chunk, retrying once if the model call fails"""
+    response = ""
+    for _ in range(attempts):
+        response = llm_utils.youtube_french_sentence_generator(chunk)
+        if not response.startswith("Error:"):
+            return parse_numbered(response)
+    raise RuntimeError(f"French sentence extraction failed: {response[len('Error:'):].strip()}")
+
+
+def extract_french_sentences(llm_utils, transcript: str, workers: int = TRANSCRIPT_WORKERS,
+                             progress: "IngestionProgress" = None) -> List[str]:
+    """
+    Complete French sentences from a raw transcript. The transcript is chunked at
+    snippet boundaries and the chunks are sent to the LLM concurrently on up to
+    `workers` threads; the results are merged in order with seam duplicates removed.
+    """
+    chunks = chunk_snippets(split_snippets(transcript))
+    if not chunks:
+        return []
+    if progress:
+        progress.set_total(len(chunks))
+
+    def extract(chunk):
+        sentences = _extract_chunk(llm_utils, chunk)
+        if progress:
+            progress.advance(sentences[-3:])
+        return sentences
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingestion") as pool:
+        chunk_sentences = list(pool.map(extract, chunks))
+    return merge_chunk_sentences(chunk_sentences)
+
+
+def _translate_batch_once(llm_utils, batch: List[str]):
+    """Translations of `batch`, or None unless the reply is numbered exactly 1..len(batch)"""
+    response = llm_utils.youtube_english_sentence_generator(format_numbered(batch))
+    if response.startswith("Error:"):
+        return None
+    items = parse_numbered_items(response)
+    if [number for number, _ in items] != list(range(1, len(batch) + 1)):
+        return None
+    return [sentence for _, sentence in items]
+
+
+def translate_batch(llm_utils, batch: List[str], retries: int = TRANSLATION_RETRIES) -> List[str]:
+    """
+    English translations aligned one-to-one with `batch`. A reply whose numbering
+    doesn't match is retried; if it still doesn't, the batch is translated one
+    sentence at a time so a single bad line can't shift the rest.
+    """
+    for _ in range(1 + retries):
+        translations = _translate_batch_once(llm_utils, batch)
+        if translations is not None:
+            return translations
+    if len(batch) == 1:
+        raise RuntimeError(f"Could not translate: {batch[0]}")
+    return [translation for sentence in batch for translation in translate_batch(llm_utils, [sentence], retries)]
+
+
+def translate_sentences(llm_utils, sentences: List[str], batch_size: int = TRANSLATION_BATCH_SIZE,
+                        workers: int = TRANSCRIPT_WORKERS,
+                        progress: "IngestionProgress" = None,
+                        on_ready: Callable[[List[str]], None] = None) -> List[str]:
+    """
+    Translate French sentences in numbered batches of `batch_size`, running up to
+    `workers` batches concurrently. The result always has one English sentence per
+    French sentence, in order; a batch that cannot be aligned raises instead.
+
+    `on_ready` is called with the English translations of the longest finished
+    prefix of `sentences` each time that prefix grows, so callers can publish
+    pairs before the remaining batches complete.
+    """
+    batches = [sentences[i:i + batch_size] for i in range(0, len(sentences), batch_size)]
+    translated = [None] * len(batches)
+    ready = 0
+    if progress:
+        progress.set_total(len(batches))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingestion") as pool:
+        futures = {pool.submit(translate_batch, llm_utils, batch): i for i, batch in enumerate(batches)}
+        for future in as_completed(futures):
+            translated[futures[future]] = future.result()
+            if progress:
+                progress.advance(translated[futures[future]][-2:])
+            previous = ready
+            while ready < len(batches) and translated[ready] is not None:
+                ready += 1
+            if on_ready and ready > previous:
+                on_ready([sentence for batch in translated[:ready] for sentence in batch])
+    return [sentence for batch in translated for sentence in batch]
+
+
+class IngestionProgress:
+    """
+    Progress of one ingestion job, updated from worker threads and read by the UI.
+    Stages run in order (fetch, segment, translate); time spent writing files is
+    recorded as its own "write" stage.
+    """
+
+    STAGES = ("fetch", "segment", "translate", "write")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stage = None
+        self.done = 0
+        self.total = 0
+        self.timings = {}
+        self.preview = []
+        self.sentences_written = 0
+        self._stage_started = None
+
+    def start(self, stage: str):
+        with self._lock:
+            self._close_stage()
+            self.stage = stage
+            self.done = 0
+            self.total = 0
+            self._stage_started = time.perf_counter()
+
+    def set_total(self, total: int):
+        with self._lock:
+            self.total = total
+
+    def advance(self, preview: List[str] = None):
+        """Mark one unit (chunk or batch) of the current stage as finished"""
+        with self._lock:
+            self.done += 1
+            if preview:
+                self.preview = (self.preview + list(preview))[-5:]
+
+    def set_written(self, count: int):
+        with self._lock:
+            self.sentences_written = count
+
+    def add_time(self, stage: str, seconds: float):
+        with self._lock:
+            self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+
+    def finish(self):
+        with self._lock:
+            self._close_stage()
+            self.stage = None
+
+    def _close_stage(self):
+        if self.stage is not None and self._stage_started is not None:
+            self.timings[self.stage] = self.timings.get(self.stage, 0.0) + time.perf_counter() - self._stage_started
+        self._stage_started = None
+
+    def snapshot(self) -> Dict:
+        """A consistent copy of the current state, including the running stage's elapsed time"""
+        with self._lock:
+            timings = dict(self.timings)
+            if self.stage is not None and self._stage_started is not None:
+                timings[self.stage] = timings.get(self.stage, 0.0) + time.perf_counter() - self._stage_started
+            return {
+                'stage': self.stage,
+                'done': self.done,
+                'total': self.total,
+                'timings': timings,
+                'preview': list(self.preview),
+                'sentences_written': self.sentences_written,
+            }
+
+
+def run_ingestion(video_url: str, llm_utils, transcript_manager, progress: IngestionProgress,
+                  on_written: Optional[Callable[[], None]] = None) -> int:
+    """
+    Background job: fetch a video's transcript, extract French sentences and
+    translate them into the transcript library. Aligned pairs are stored as soon
+    as each leading run of batches is translated, and `on_written` is called after
+    every write so the new sentences can be practised right away. Returns the
+    number of pairs.
+    """
+    video_id = parse_video_id(video_url)
+    progress.start("fetch")
+    transcript = transcript_manager.extract_transcript(video_url)
+
+    progress.start("segment")
+    french = extract_french_sentences(llm_utils, transcript, progress=progress)
+    if not french:
+        raise RuntimeError("No French sentences found in the transcript")
+
+    save_transcript_video(video_id, video_url)
+    written = 0
+
+    def publish(english: List[str]):
+        nonlocal written
+        started = time.perf_counter()
+        save_transcript_pairs(video_id, written, french[written:len(english)], english[written:])
+        written = len(english)
+        progress.add_time("write", time.perf_counter() - started)
+        progress.set_written(written)
+        if on_written:
+            on_written()
+
+    progress.start("translate")
+    translate_sentences(llm_utils, french, progress=progress, on_ready=publish)
+    # A re-ingested video may now have fewer sentences than before
+    if trim_transcript(video_id, len(french)) and on_written:
+        on_written()
+    progress.finish()
+    return len(french)
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Optional
+from config.settings import DB_TIMEOUT, LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES
+
+
+def normalize_text(text: str) -> str:
+    """Normalize unicode and whitespace so equivalent inputs share a cache key"""
+    return " ".join(unicodedata.normalize("NFC", str(text)).split())
+
+
+def normalize_word(word: str) -> str:
+    """Normalize a single word lookup (case-insensitive)"""
+    return normalize_text(word).lower()
+
+
+class LLMCache:
+    """
+    Disk-backed cache for LLM responses.
+
+    Entries are keyed on a hash of (model, prompt template, template version, inputs),
+    expire after `ttl` seconds and are evicted least-recently-used once the cache
+    holds more than `max_entries` rows. Values are stored as JSON.
+    """
+
+    def __init__(self, db_path: Path = LLM_CACHE_PATH, ttl: int = LLM_CACHE_TTL,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=DB_TIMEOUT, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)")
+
+    @staticmethod
+    def make_key(model: str, template: str, version: int, *inputs: Any) -> str:
+        payload = json.dumps([model, template, version, list(inputs)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss or expired entry"""
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if self.ttl and now - row[1] > self.ttl:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    return None
+                self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            print(f"LLM cache read error: {e}")
+            return None
+
+    def set(self, key: str, value: Any):
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), now, now)
+                )
+                self._evict()
+        except (sqlite3.Error, TypeError) as e:
+            print(f"LLM cache write error: {e}")
+
+    def _evict(self):
+        """Drop expired entries, then the least recently used ones beyond max_entries"""
+        if self.ttl:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl,))
+        excess = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                (excess,)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
@@ -1,12 +1,20 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable
 from ast import literal_eval
-import re, os
+import re, os, json
 from config.settings import GROQ_MODEL, GROQ_TRANSCRIPT_MODEL
-from groq import Groq
+from core.llm_cache import LLMCache, normalize_text, normalize_word
 from dotenv import load_dotenv
 load_dotenv()
 import streamlit as st
 
+# Bump a template's version whenever its prompt changes so stale cached answers are ignored
+PROMPT_VERSIONS = {
+    "word_meaning": 1,
+    "correct_accents": 1,
+    "example_sentence": 1,
+    "conjugation": 1,
+}
+
 
 class LLMUtils:
     
@@ -27,10 +35,38 @@ class LLMUtils:
         if not api_key:
             raise ValueError("GROQ_API_KEY not found in Streamlit secrets or environment variables.")
         
+        from groq import Groq
         self.api_key = api_key
         self.groq_client = Groq(api_key=self.api_key)  
+        self.cache = LLMCache()
         
     
+    def _chat(self, prompt: str, model: str = GROQ_MODEL) -> str:
+        """Send a single-message prompt and return the stripped response text"""
+        response = self.groq_client.chat.completions.create(
+            messages=[{"role": "user", "content": prompt}],
+            model=model )
+        return response.choices[0].message.content.strip()
+    
+    
+    def _cache_key(self, template: str, model: str, *inputs: Any) -> str:
+        return LLMCache.make_key(model, template, PROMPT_VERSIONS[template], *inputs)
+    
+    
+    def _cached(self, template: str, model: str, inputs: tuple, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached response for (model, template version, inputs), calling
+        `compute` and storing its result on a miss. Exceptions are never cached.
+        """
+        key = self._cache_key(template, model, *inputs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        result = compute()
+        self.cache.set(key, result)
+        return result
+    
+    
     def get_french_word_meaning(self, word: str) -> str:
         """
         Get the meaning of a French word using a language model.
@@ -38,13 +74,69 @@ class LLMUtils:
         prompt = f"""Please provide the meaning of the French word '{word}' in English. Return up to 3 meanings as a single comma seperated list. 
         Do not explain or add any additional text.
         Fromat the output as : 'meaning1, meaning2, meaning3'."""
-        response = self.groq_client.chat.completions.create(
-            messages=[
-             {"role": "user", "content": prompt}],
-            model=GROQ_MODEL )
         
-        return response.choices[0].message.content.strip()
-    
+        return self._cached("word_meaning", GROQ_MODEL, (normalize_word(word),),
+                            lambda: self._chat(prompt, GROQ_MODEL))
+
+
+    def get_french_word_meanings(self, words: List[str]) -> Dict[str, str]:
+        """
+        Get the meanings of several French words with a single LLM call.
+
+        Cached words are served locally; the rest are requested together as a JSON
+        object. Any word the model leaves out falls back to a single lookup.
+
+        Args:
+            words: The French words to look up
+
+        Returns:
+            A dict mapping each word to a 'meaning1, meaning2, meaning3' string
+        """
+        meanings = {}
+        missing = []
+        for word in words:
+            key = self._cache_key("word_meaning", GROQ_MODEL, normalize_word(word))
+            cached = self.cache.get(key)
+            if cached is not None:
+                meanings[word] = cached
+            else:
+                missing.append(word)
+
+        if len(missing) == 1:
+            meanings[missing[0]] = self.get_french_word_meaning(missing[0])
+        elif missing:
+            prompt = f"""Provide the English meaning of each of these French words: {json.dumps(missing, ensure_ascii=False)}
+        For each word return up to 3 meanings as a single comma seperated string.
+        Return ONLY a JSON object mapping every word exactly as given to its meanings.
+        Example: {{"manger": "to eat, to consume", "maison": "house, home"}}"""
+            try:
+                response = self.groq_client.chat.completions.create(
+                    messages=[{"role": "user", "content": prompt}],
+                    model=GROQ_MODEL,
+                    response_format={"type": "json_object"}
+                )
+                result = json.loads(response.choices[0].message.content)
+            except Exception as e:
+                print(f"Batch meaning lookup failed: {e}")
+                result = {}
+
+            # Match keys the way the cache does, so a model that changes the case or
+            # Unicode form of a word (e.g. "Élève" for "élève") still answers it
+            if not isinstance(result, dict):
+                result = {}
+            result = {normalize_word(key): value for key, value in result.items()}
+            for word in missing:
+                meaning = result.get(normalize_word(word))
+                if isinstance(meaning, str) and meaning.strip():
+                    meaning = meaning.strip()
+                    key = self._cache_key("word_meaning", GROQ_MODEL, normalize_word(word))
+                    self.cache.set(key, meaning)
+                else:
+                    meaning = self.get_french_word_meaning(word)
+                meanings[word] = meaning
+
+        return meanings
+
     
     def correct_french_accents(self, word: str) -> str:
         prompt = f"""Correct any accent errors in this French text: "{word}"
@@ -60,14 +152,14 @@ class LLMUtils:
             
             Return ONLY the corrected text:"""
         
-        response = self.groq_client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model=GROQ_MODEL )
+        def compute():
+            response = self._chat(prompt, GROQ_MODEL)
+            response = re.sub(r'^[\'"]|[\'"]$', '', response)
+            response = re.sub(r'^[\'"]|[\'"]$', '', response)
+            return response
         
-        response = response.choices[0].message.content.strip()
-        response = re.sub(r'^[\'"]|[\'"]$', '', response)
-        response = re.sub(r'^[\'"]|[\'"]$', '', response)
-        return response
+        # Accent correction must preserve capitalization, so only whitespace/unicode is normalized
+        return self._cached("correct_accents", GROQ_MODEL, (normalize_text(word),), compute)
     
     
     def extract_missed_words(self, correct: str, attempt: str) -> List[str]:
@@ -109,12 +201,8 @@ class LLMUtils:
             """
             prompt = f"Generate a french sentence using the French word '{word}'. Only return the sentence without any explanation or additional text."
             
-            response = self.groq_client.chat.completions.create(
-                    messages=[
-                    {"role": "user", "content": prompt}],
-                    model=GROQ_MODEL )
-            
-            return response.choices[0].message.content.strip()
+            return self._cached("example_sentence", GROQ_MODEL, (normalize_word(word),),
+                                lambda: self._chat(prompt, GROQ_MODEL))
         
     
     def conjugation_details(self, word: str) -> str:
@@ -142,12 +230,8 @@ class LLMUtils:
     3. Return ONLY the conjugations or 'not a verb' - no explanations, no additional text."""
 
         try:
-            response = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=GROQ_MODEL
-            )
-            
-            return response.choices[0].message.content.strip()
+            return self._cached("conjugation", GROQ_MODEL, (normalize_word(word),),
+                                lambda: self._chat(prompt, GROQ_MODEL))
         
         except Exception as e:
             return f"Error: {str(e)}"
@@ -0,0 +1,236 @@
+import hashlib
+import re
+import sqlite3
+
+# Schema migrations for the local SQLite database. The database's
+# PRAGMA user_version records how many have been applied; each migration runs in
+# its own transaction together with the version bump. Append new migrations to
+# MIGRATIONS and never edit or reorder ones that have shipped.
+
+
+def create_base_schema(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS missing_words (
+            word TEXT PRIMARY KEY,
+            meaning TEXT,
+            added_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            conjugation TEXT
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS translation_scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sentence TEXT,
+            user_translation TEXT,
+            score INTEGER,
+            checked_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def add_conjugation_column(conn: sqlite3.Connection):
+    """Databases created before conjugations were stored lack this column"""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(missing_words)")]
+    if 'conjugation' not in columns:
+        conn.execute("ALTER TABLE missing_words ADD COLUMN conjugation TEXT")
+
+
+def add_analytics_indexes(conn: sqlite3.Connection):
+    """
+    Indexes matching the score and vocab queries in core.database. The expression
+    indexes must use exactly the same expressions as the queries to be chosen.
+    """
+    # Score history (ORDER BY checked_on) and overall statistics
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_scores_checked_on ON translation_scores (checked_on, score)")
+    # Daily aggregates and days_active: GROUP BY / COUNT(DISTINCT DATE(checked_on))
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_scores_day ON translation_scores (DATE(checked_on), score)")
+    # Weekly aggregates: GROUP BY STRFTIME('%Y-%W', checked_on), covering week_start too
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_scores_week "
+        "ON translation_scores (STRFTIME('%Y-%W', checked_on), checked_on, score)"
+    )
+    # Vocabulary list, newest first
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_words_added_on ON missing_words (added_on)")
+
+
+# Rebuild aggregate rows from translation_scores; {where} selects the days/weeks to rebuild
+DAILY_AGGREGATE_SQL = '''
+    INSERT INTO daily_scores (day, attempt_count, score_sum, min_score, max_score)
+    SELECT DATE(checked_on), COUNT(*), COALESCE(SUM(score), 0), MIN(score), MAX(score)
+    FROM translation_scores WHERE {where}
+    GROUP BY DATE(checked_on)
+'''
+WEEKLY_AGGREGATE_SQL = '''
+    INSERT INTO weekly_scores (week, week_start, attempt_count, score_sum, min_score, max_score)
+    SELECT STRFTIME('%Y-%W', checked_on), MIN(DATE(checked_on, 'weekday 0', '-7 days')),
+           COUNT(*), COALESCE(SUM(score), 0), MIN(score), MAX(score)
+    FROM translation_scores WHERE {where}
+    GROUP BY STRFTIME('%Y-%W', checked_on)
+'''
+
+
+def _recompute_aggregates_sql(row: str) -> str:
+    """Trigger statements that rebuild the day and week containing `row` (OLD or NEW)"""
+    day = f"DATE({row}.checked_on)"
+    week = f"STRFTIME('%Y-%W', {row}.checked_on)"
+    return (
+        f"DELETE FROM daily_scores WHERE day = {day};"
+        + DAILY_AGGREGATE_SQL.format(where=f"DATE(checked_on) = {day}") + ";"
+        + f"DELETE FROM weekly_scores WHERE week = {week};"
+        + WEEKLY_AGGREGATE_SQL.format(where=f"STRFTIME('%Y-%W', checked_on) = {week}") + ";"
+    )
+
+
+def add_score_aggregates(conn: sqlite3.Connection):
+    """
+    Per-day and per-week running totals of translation_scores, kept current by
+    triggers so the dashboard reads O(days) rows instead of scanning every attempt.
+    Inserts update the totals in place; the rare update or delete rebuilds the
+    affected day and week from the indexed base table. Existing history is backfilled.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS daily_scores (
+            day TEXT PRIMARY KEY,
+            attempt_count INTEGER NOT NULL,
+            score_sum INTEGER NOT NULL,
+            min_score INTEGER,
+            max_score INTEGER
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS weekly_scores (
+            week TEXT PRIMARY KEY,
+            week_start TEXT NOT NULL,
+            attempt_count INTEGER NOT NULL,
+            score_sum INTEGER NOT NULL,
+            min_score INTEGER,
+            max_score INTEGER
+        )
+    ''')
+    # MIN/MAX ignore NULL scores, matching the aggregate functions they replace
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_scores_insert AFTER INSERT ON translation_scores
+        WHEN NEW.checked_on IS NOT NULL
+        BEGIN
+            INSERT INTO daily_scores (day, attempt_count, score_sum, min_score, max_score)
+            VALUES (DATE(NEW.checked_on), 1, COALESCE(NEW.score, 0), NEW.score, NEW.score)
+            ON CONFLICT (day) DO UPDATE SET
+                attempt_count = attempt_count + 1,
+                score_sum = score_sum + excluded.score_sum,
+                min_score = COALESCE(MIN(min_score, excluded.min_score), min_score, excluded.min_score),
+                max_score = COALESCE(MAX(max_score, excluded.max_score), max_score, excluded.max_score);
+            INSERT INTO weekly_scores (week, week_start, attempt_count, score_sum, min_score, max_score)
+            VALUES (STRFTIME('%Y-%W', NEW.checked_on), DATE(NEW.checked_on, 'weekday 0', '-7 days'),
+                    1, COALESCE(NEW.score, 0), NEW.score, NEW.score)
+            ON CONFLICT (week) DO UPDATE SET
+                week_start = MIN(week_start, excluded.week_start),
+                attempt_count = attempt_count + 1,
+                score_sum = score_sum + excluded.score_sum,
+                min_score = COALESCE(MIN(min_score, excluded.min_score), min_score, excluded.min_score),
+                max_score = COALESCE(MAX(max_score, excluded.max_score), max_score, excluded.max_score);
+        END
+    ''')
+    for event, rows in (("DELETE", ("OLD",)), ("UPDATE", ("OLD", "NEW"))):
+        statements = "".join(_recompute_aggregates_sql(row) for row in rows)
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_scores_{event.lower()} AFTER {event} ON translation_scores
+            BEGIN
+                {statements}
+            END
+        ''')
+    conn.execute("DELETE FROM daily_scores")
+    conn.execute("DELETE FROM weekly_scores")
+    conn.execute(DAILY_AGGREGATE_SQL.format(where="checked_on IS NOT NULL"))
+    conn.execute(WEEKLY_AGGREGATE_SQL.format(where="checked_on IS NOT NULL"))
+
+
+# Helpers for importing the legacy transcript files, frozen here so the shipped
+# migration doesn't change with the application code it was written against
+_LEGACY_NUMBERED_LINE = re.compile(r"^\s*(\d+)\s*[.)]\s+(.+?)\s*$")
+_LEGACY_VIDEO_ID = re.compile(r"(?:[?&]v=|youtu\.be/|/embed/|/v/)([\w-]+)")
+
+
+def _legacy_sentences(path) -> list:
+    """Sentences from a '1. ...' numbered transcript file"""
+    matches = (_LEGACY_NUMBERED_LINE.match(line) for line in path.read_text(encoding="utf-8").splitlines())
+    return [match.group(2) for match in matches if match]
+
+
+def _legacy_pair_hash(french: str, english: str) -> str:
+    return hashlib.sha1(f"{french}\n{english}".encode("utf-8")).hexdigest()[:16]
+
+
+def add_transcript_library(conn: sqlite3.Connection):
+    """
+    Sentence pairs for every processed video, replacing the single-video transcript
+    files. The pair table is clustered on (video_id, idx) so a page of one video is a
+    contiguous range read. The existing transcript files, if any, become the first
+    video in the library; files whose lengths differ are not aligned and are skipped.
+    """
+    from config.settings import TRANSCRIPT_FR, TRANSCRIPT_EN, LINK_YOUTUBE
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS transcript_videos (
+            video_id TEXT PRIMARY KEY,
+            url TEXT,
+            added_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS transcript_sentences (
+            video_id TEXT NOT NULL,
+            idx INTEGER NOT NULL,
+            hash TEXT NOT NULL,
+            french TEXT NOT NULL,
+            english TEXT NOT NULL,
+            PRIMARY KEY (video_id, idx)
+        ) WITHOUT ROWID
+    ''')
+
+    try:
+        french = _legacy_sentences(TRANSCRIPT_FR)
+        english = _legacy_sentences(TRANSCRIPT_EN)
+    except FileNotFoundError:
+        return
+    if not french or len(french) != len(english):
+        if french or english:
+            print(f"Skipped importing the transcript files: English={len(english)}, French={len(french)} sentences")
+        return
+    url = LINK_YOUTUBE.read_text(encoding="utf-8").strip() if LINK_YOUTUBE.exists() else None
+    match = _LEGACY_VIDEO_ID.search(url or "")
+    video_id = match.group(1) if match else "imported"
+    conn.execute("INSERT OR IGNORE INTO transcript_videos (video_id, url) VALUES (?, ?)", (video_id, url))
+    conn.executemany(
+        "INSERT OR IGNORE INTO transcript_sentences (video_id, idx, hash, french, english) VALUES (?, ?, ?, ?, ?)",
+        [(video_id, i, _legacy_pair_hash(fr, en), fr, en) for i, (fr, en) in enumerate(zip(french, english))]
+    )
+
+
+MIGRATIONS = [
+    create_base_schema,
+    add_conjugation_column,
+    add_analytics_indexes,
+    add_score_aggregates,
+    add_transcript_library,
+]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(conn: sqlite3.Connection) -> int:
+    """Apply every pending migration in order; returns the number applied"""
+    version = schema_version(conn)
+    pending = MIGRATIONS[version:]
+    for number, migration in enumerate(pending, start=version + 1):
+        conn.commit()
+        conn.execute("BEGIN")
+        try:
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return len(pending)
@@ -0,0 +1,360 @@
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+# One storage interface for every page. Saved words are always returned as dicts
+# with 'word', 'meaning', 'added_on' and 'conjugation' keys, whichever backend
+# holds them; score queries return the same DataFrames / dicts as core.database.
+# Failures raise: repositories are also used by background jobs, which must not
+# call st.*, so errors are reported by the page that made the call.
+
+
+class Repository(ABC):
+    """Base class for the storage backends; see get_repository() in core.resources"""
+
+    name = None
+
+    @abstractmethod
+    def save_missing_words(self, words: List[str]) -> List[str]:
+        """Save new words with their meanings; returns the words that were added"""
+
+    @abstractmethod
+    def add_word(self, word: str, meaning: str) -> bool:
+        """Insert a single word; returns False if it already existed"""
+
+    @abstractmethod
+    def word_exists(self, word: str) -> bool:
+        ...
+
+    @abstractmethod
+    def save_conjugation(self, word: str, conjugation: str):
+        ...
+
+    @abstractmethod
+    def get_all_saved_words(self, include_conjugation: bool = True) -> List[Dict]:
+        """All saved words, newest first; conjugation is None unless include_conjugation"""
+
+    @abstractmethod
+    def get_saved_words_page(self, offset: int, limit: int) -> List[Dict]:
+        """`limit` saved words starting at `offset`, in get_all_saved_words order"""
+
+    @abstractmethod
+    def count_saved_words(self) -> int:
+        ...
+
+    @abstractmethod
+    def get_vocab_version(self):
+        """Value that changes whenever words are added or deleted, for keying cached indexes"""
+
+    @abstractmethod
+    def delete_saved_word(self, word: str):
+        ...
+
+    @abstractmethod
+    def delete_saved_words(self, words: Iterable[str]):
+        ...
+
+    @abstractmethod
+    def save_score(self, sentence: str, user_translation: str, score: int):
+        ...
+
+    @abstractmethod
+    def get_score_history(self):
+        ...
+
+    @abstractmethod
+    def get_score_version(self):
+        """Value that changes whenever a score is saved or deleted, for keying cached analytics"""
+
+    @abstractmethod
+    def get_daily_scores(self):
+        ...
+
+    @abstractmethod
+    def get_weekly_progress(self):
+        ...
+
+    @abstractmethod
+    def get_score_statistics(self) -> Dict:
+        ...
+
+
+class SQLiteRepository(Repository):
+    """Local SQLite database at DB_PATH (see core.database)"""
+
+    name = "sqlite"
+
+    def __init__(self):
+        import core.database as db
+        self.db = db
+
+    def save_missing_words(self, words):
+        return self.db.save_missing_words(words)
+
+    def add_word(self, word, meaning):
+        return self.db.add_word(word, meaning)
+
+    def word_exists(self, word):
+        return self.db.word_exists(word)
+
+    def save_conjugation(self, word, conjugation):
+        self.db.save_conjugation(word, conjugation)
+
+    def get_all_saved_words(self, include_conjugation=True):
+        if not include_conjugation:
+            return [
+                {'word': word, 'meaning': meaning, 'added_on': added_on, 'conjugation': None}
+                for word, meaning, added_on in self.db.get_all_saved_words()
+            ]
+        return [
+            {'word': word, 'meaning': meaning, 'added_on': added_on, 'conjugation': conjugation}
+            for word, meaning, added_on, conjugation in self.db.get_all_saved_words(include_conjugation=True)
+        ]
+
+    def get_saved_words_page(self, offset, limit):
+        return [
+            {'word': word, 'meaning': meaning, 'added_on': added_on, 'conjugation': conjugation}
+            for word, meaning, added_on, conjugation in self.db.get_saved_words_page(offset, limit)
+        ]
+
+    def count_saved_words(self):
+        return self.db.count_saved_words()
+
+    def get_vocab_version(self):
+        return self.db.get_vocab_version()
+
+    def delete_saved_word(self, word):
+        self.db.delete_saved_word(word)
+
+    def delete_saved_words(self, words):
+        self.db.delete_saved_words(words)
+
+    def save_score(self, sentence, user_translation, score):
+        self.db.save_score(sentence, user_translation, score)
+
+    def get_score_history(self):
+        return self.db.get_score_history()
+
+    def get_score_version(self):
+        return self.db.get_score_version()
+
+    def get_daily_scores(self):
+        return self.db.get_daily_scores()
+
+    def get_weekly_progress(self):
+        return self.db.get_weekly_progress()
+
+    def get_score_statistics(self):
+        return self.db.get_score_statistics()
+
+
+class SupabaseRepository(Repository):
+    """Hosted Supabase tables through a shared SupabaseDB client"""
+
+    name = "supabase"
+
+    def __init__(self, client):
+        self.client = client
+
+    def save_missing_words(self, words):
+        return self.client.save_missing_words(words)
+
+    def add_word(self, word, meaning):
+        return self.client.add_word(word, meaning)
+
+    def word_exists(self, word):
+        return self.client.word_exists(word)
+
+    def save_conjugation(self, word, conjugation):
+        self.client.save_conjugation(word, conjugation)
+
+    @staticmethod
+    def _word_row(row):
+        return {'word': row.get('word'), 'meaning': row.get('meaning'),
+                'added_on': row.get('added_on'), 'conjugation': row.get('conjugation')}
+
+    def get_all_saved_words(self, include_conjugation=True):
+        return [self._word_row(row) for row in self.client.get_all_saved_words(include_conjugation)]
+
+    def get_saved_words_page(self, offset, limit):
+        return [self._word_row(row) for row in self.client.get_saved_words_page(offset, limit)]
+
+    def count_saved_words(self):
+        return self.client.count_saved_words()
+
+    def get_vocab_version(self):
+        return self.client.get_vocab_version()
+
+    def delete_saved_word(self, word):
+        self.client.delete_saved_word(word)
+
+    def delete_saved_words(self, words):
+        self.client.delete_saved_words(words)
+
+    def save_score(self, sentence, user_translation, score):
+        self.client.save_score(sentence, user_translation, score)
+
+    def get_score_history(self):
+        return self.client.get_score_history()
+
+    def get_score_version(self):
+        return self.client.get_score_version()
+
+    def get_daily_scores(self):
+        return self.client.get_daily_scores()
+
+    def get_weekly_progress(self):
+        return self.client.get_weekly_progress()
+
+    def get_score_statistics(self):
+        return self.client.get_score_statistics()
+
+
+class InMemoryRepository(Repository):
+    """
+    Process-local storage with no network or disk access, for benchmarks and
+    offline development. Meanings come from `lookup_meanings` (a callable taking
+    a list of words and returning {word: meaning}); by default the shared LLM.
+    """
+
+    name = "memory"
+
+    def __init__(self, lookup_meanings: Optional[Callable[[List[str]], Dict[str, str]]] = None):
+        self.lookup_meanings = lookup_meanings
+        self._lock = threading.Lock()
+        self._words = {}
+        self._scores = []
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    def save_missing_words(self, words):
+        candidates = list(dict.fromkeys(word.strip() for word in words if len(word.strip()) > 3))
+        with self._lock:
+            new_words = [word for word in candidates if word not in self._words]
+        if not new_words:
+            return []
+        lookup = self.lookup_meanings
+        if lookup is None:
+            from core.resources import get_llm_utils
+            lookup = get_llm_utils().get_french_word_meanings
+        meanings = lookup(new_words)
+        return [word for word in new_words if self.add_word(word, meanings.get(word, ''))]
+
+    def add_word(self, word, meaning):
+        with self._lock:
+            if word in self._words:
+                return False
+            self._words[word] = {'word': word, 'meaning': meaning, 'added_on': self._now(), 'conjugation': None}
+            return True
+
+    def word_exists(self, word):
+        with self._lock:
+            return word in self._words
+
+    def save_conjugation(self, word, conjugation):
+        with self._lock:
+            if word in self._words:
+                self._words[word]['conjugation'] = conjugation
+
+    def get_all_saved_words(self, include_conjugation=True):
+        with self._lock:
+            rows = [dict(row) for row in self._words.values()]
+        if not include_conjugation:
+            for row in rows:
+                row['conjugation'] = None
+        # Insertion order breaks ties between words added in the same second
+        return list(reversed(rows))
+
+    def get_saved_words_page(self, offset, limit):
+        return self.get_all_saved_words()[offset:offset + limit]
+
+    def count_saved_words(self):
+        with self._lock:
+            return len(self._words)
+
+    def get_vocab_version(self):
+        # Words are never re-added in place, so count plus newest entry identifies the list
+        with self._lock:
+            newest = next(reversed(self._words), None)
+            return (len(self._words), newest)
+
+    def delete_saved_word(self, word):
+        with self._lock:
+            self._words.pop(word, None)
+
+    def delete_saved_words(self, words):
+        with self._lock:
+            for word in words:
+                self._words.pop(word, None)
+
+    def save_score(self, sentence, user_translation, score, checked_on=None):
+        """`checked_on` defaults to now; benchmarks pass their own to spread the history over time"""
+        with self._lock:
+            self._scores.append({
+                'id': len(self._scores) + 1,
+                'sentence': sentence,
+                'user_translation': user_translation,
+                'score': score,
+                'checked_on': checked_on or self._now()
+            })
+
+    def get_score_history(self):
+        import pandas as pd
+        with self._lock:
+            return pd.DataFrame(list(self._scores))
+
+    def get_score_version(self):
+        with self._lock:
+            if not self._scores:
+                return (0, None, None)
+            return (len(self._scores), self._scores[-1]['id'], self._scores[-1]['checked_on'])
+
+    def get_daily_scores(self):
+        df = self._scores_with_dates()
+        if df.empty:
+            return df
+        grouped = df.groupby(df['checked_on'].dt.date)['score']
+        daily = grouped.agg(attempt_count='count', avg_score='mean', min_score='min', max_score='max')
+        daily.index = daily.index.astype(str)
+        return daily.rename_axis('date').reset_index().sort_values('date', ascending=False, ignore_index=True)
+
+    def get_weekly_progress(self):
+        import pandas as pd
+        df = self._scores_with_dates()
+        if df.empty:
+            return df
+        # Same week and week_start as the SQLite query: DATE(checked_on, 'weekday 0', '-7 days')
+        df['week'] = df['checked_on'].dt.strftime('%Y-%W')
+        dates = df['checked_on'].dt.normalize()
+        offset = 7 - (6 - dates.dt.weekday) % 7
+        df['week_start'] = (dates - pd.to_timedelta(offset, unit='D')).dt.strftime('%Y-%m-%d')
+        weekly = df.groupby('week').agg(
+            week_start=('week_start', 'min'),
+            attempt_count=('score', 'count'),
+            avg_score=('score', 'mean'),
+            min_score=('score', 'min'),
+            max_score=('score', 'max')
+        )
+        return weekly.reset_index().sort_values('week_start', ascending=False, ignore_index=True)
+
+    def get_score_statistics(self):
+        with self._lock:
+            scores = [row['score'] for row in self._scores]
+            days = {row['checked_on'][:10] for row in self._scores}
+        return {
+            'total_attempts': len(scores),
+            'overall_avg': round(sum(scores) / len(scores), 2) if scores else 0,
+            'min_score': min(scores) if scores else 0,
+            'max_score': max(scores) if scores else 0,
+            'days_active': len(days)
+        }
+
+    def _scores_with_dates(self):
+        import pandas as pd
+        df = self.get_score_history()
+        if not df.empty:
+            df['checked_on'] = pd.to_datetime(df['checked_on'])
+        return df
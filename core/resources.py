@@ -0,0 +1,69 @@
+import streamlit as st
+from config.settings import DB_PATH, SUPABASE_PROBE_TTL, STORAGE_BACKEND
+
+# Process-wide shared clients. Each getter builds its client lazily on first use and
+# caches it per server (not per session), so all sessions and background jobs share
+# one Groq client, one Supabase client and one set of loaded transcripts.
+
+
+@st.cache_resource(show_spinner=False)
+def get_llm_utils():
+    from core.llm_utils import LLMUtils
+    return LLMUtils()
+
+
+@st.cache_resource(show_spinner=False)
+def get_supabase_db():
+    from core.database_supabase import SupabaseDB
+    return SupabaseDB(llm_utils=get_llm_utils())
+
+
+@st.cache_resource(show_spinner=False)
+def init_local_db():
+    """Create the SQLite schema once per process"""
+    from core.database import init_db
+    init_db(DB_PATH)
+
+
+@st.cache_data(ttl=SUPABASE_PROBE_TTL, show_spinner=False)
+def check_supabase():
+    """
+    Return (available, error message). The probe reads at most one row and its
+    result is reused for SUPABASE_PROBE_TTL seconds across all sessions.
+    """
+    try:
+        get_supabase_db().ping()
+        return True, None
+    except Exception as e:
+        return False, str(e)
+
+
+def get_backend() -> str:
+    """Resolve STORAGE_BACKEND, turning "auto" into "supabase" or "sqlite" using the cached probe"""
+    if STORAGE_BACKEND != "auto":
+        return STORAGE_BACKEND
+    return "supabase" if check_supabase()[0] else "sqlite"
+
+
+@st.cache_resource(show_spinner=False)
+def _build_repository(backend: str):
+    from core.repository import SQLiteRepository, SupabaseRepository, InMemoryRepository
+    if backend == "supabase":
+        return SupabaseRepository(get_supabase_db())
+    if backend == "memory":
+        return InMemoryRepository()
+    init_local_db()
+    return SQLiteRepository()
+
+
+def get_repository(backend: str = None):
+    """The shared Repository for `backend`, or for the active storage backend by default"""
+    return _build_repository(backend or get_backend())
+
+
+@st.cache_resource(show_spinner=False)
+def get_transcript_manager():
+    """Shared transcript library reader; call get_transcript_manager.clear() after the library changes"""
+    from core.transcript_processing import TranscriptManager
+    init_local_db()
+    return TranscriptManager()
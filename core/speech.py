@@ -0,0 +1,74 @@
+import io
+import json
+from typing import TYPE_CHECKING
+import streamlit as st
+from config.settings import VOSK_MODEL_PATH, VOSK_CHUNK_FRAMES, VOSK_SAMPLE_RATE, SPEECH_ENGINE
+
+if TYPE_CHECKING:
+    import speech_recognition as sr
+
+
+@st.cache_resource(show_spinner="Loading speech model...")
+def get_vosk_model():
+    """Load the bundled Vosk model once per process"""
+    from vosk import Model, SetLogLevel
+    SetLogLevel(-1)
+    return Model(str(VOSK_MODEL_PATH))
+
+
+def load_audio(audio_bytes: bytes) -> "sr.AudioData":
+    """
+    Decode recorded WAV/AIFF/FLAC bytes entirely in memory.
+    Multi-channel audio is downmixed to mono.
+    """
+    import speech_recognition as sr
+    with sr.AudioFile(io.BytesIO(audio_bytes)) as source:
+        return sr.Recognizer().record(source)
+
+
+def transcribe_google(audio: "sr.AudioData") -> str:
+    import speech_recognition as sr
+    return sr.Recognizer().recognize_google(audio, language='fr-FR')
+
+
+def transcribe_vosk(audio: "sr.AudioData") -> str:
+    """
+    Transcribe offline with Vosk. The audio is resampled to 16-bit PCM at
+    VOSK_SAMPLE_RATE and fed to the recognizer in VOSK_CHUNK_FRAMES chunks.
+    Returns an empty string when nothing was recognized.
+    """
+    from vosk import KaldiRecognizer
+
+    pcm = memoryview(audio.get_raw_data(convert_rate=VOSK_SAMPLE_RATE, convert_width=2))
+    recognizer = KaldiRecognizer(get_vosk_model(), VOSK_SAMPLE_RATE)
+    chunk_size = VOSK_CHUNK_FRAMES * 2
+    for start in range(0, len(pcm), chunk_size):
+        recognizer.AcceptWaveform(bytes(pcm[start:start + chunk_size]))
+    return json.loads(recognizer.FinalResult()).get("text", "")
+
+
+def audio_to_text(audio_file, engine=SPEECH_ENGINE):
+    """Convert recorded audio (an UploadedFile or raw bytes) to text using speech recognition"""
+    import speech_recognition as sr
+    try:
+        # Handle UploadedFile object
+        if hasattr(audio_file, 'getvalue'):
+            audio_bytes = audio_file.getvalue()
+        elif hasattr(audio_file, 'read'):
+            audio_bytes = audio_file.read()
+        else:
+            audio_bytes = audio_file
+
+        audio = load_audio(audio_bytes)
+        if engine == "vosk":
+            text = transcribe_vosk(audio)
+            if not text:
+                raise sr.UnknownValueError()
+            return text
+        return transcribe_google(audio)
+    except sr.UnknownValueError:
+        return "Could not understand audio"
+    except sr.RequestError as e:
+        return f"Speech recognition error: {e}"
+    except Exception as e:
+        return f"Error processing audio: {e}"
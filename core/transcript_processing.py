@@ -1,102 +1,152 @@
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Sequence, Tuple
 import random
-from config.settings import TRANSCRIPT_EN, TRANSCRIPT_FR
-import re
-from urllib.parse import urlparse, parse_qs
 import streamlit as st
-from youtube_transcript_api import YouTubeTranscriptApi
-from config.settings import TRANSCRIPT_YOUTUBE
+from config.settings import TRANSCRIPT_YOUTUBE, TRANSCRIPT_PAGE_SIZE, TRANSCRIPT_PAGE_CACHE
+from core.database import get_transcript_videos, get_transcript_page
+from core.ingestion import parse_video_id
+
+
+def shuffled_position(pointer: int, total: int, seed: int) -> int:
+    """
+    The pointer-th position of a pseudo-random permutation of range(total) keyed by
+    `seed`: a four-round Feistel network over the next power-of-four domain, walking
+    the cycle until the result falls inside range(total).
+    """
+    half = max(1, ((total - 1).bit_length() + 1) // 2)
+    mask = (1 << half) - 1
+    position = pointer
+    while True:
+        left, right = position >> half, position & mask
+        for round_key in range(4):
+            left, right = right, left ^ (hash((seed, round_key, right)) & mask)
+        position = (left << half) | right
+        if position < total:
+            return position
 
 
 class TranscriptManager:
-    
+    """
+    Sentence pairs from the transcript library. Only the per-video sentence counts
+    are held in memory; pairs are read from the database a page at a time and the
+    most recently used pages are cached, so memory stays flat as the library grows.
+
+    Practice samples every pair of the selected videos (all videos by default) once
+    per cycle. The order is a keyed pseudo-random permutation of the pair positions
+    (see shuffled_position), so the per-session state is a seed and a pointer
+    rather than a shuffled index list as long as the library.
+    """
+
     def __init__(self):
-        
-        self.english_sentences = self._load_transcript(TRANSCRIPT_EN)
-        self.french_sentences = self._load_transcript(TRANSCRIPT_FR)
-        
+        self.videos = get_transcript_videos()
+        self.counts = {video_id: count for video_id, _, _, count in self.videos}
+        self._page = lru_cache(maxsize=TRANSCRIPT_PAGE_CACHE)(self._load_page)
+
+    def _load_page(self, video_id: str, page: int) -> List[Tuple[str, str]]:
+        return get_transcript_page(video_id, page * TRANSCRIPT_PAGE_SIZE, TRANSCRIPT_PAGE_SIZE)
+
+    def get_pair(self, video_id: str, idx: int) -> Tuple[str, str]:
+        """(english, french) pair `idx` of a video"""
+        return self._page(video_id, idx // TRANSCRIPT_PAGE_SIZE)[idx % TRANSCRIPT_PAGE_SIZE]
+
+    def get_page(self, video_id: str, page: int) -> List[Tuple[str, str]]:
+        return self._page(video_id, page)
+
+    def iter_pairs(self, video_ids: Sequence[str] = None) -> Iterator[Tuple[str, str]]:
+        """Every (english, french) pair of the given videos (default all), read page by page"""
+        for video_id in video_ids or self.counts:
+            for page in range(-(-self.counts.get(video_id, 0) // TRANSCRIPT_PAGE_SIZE)):
+                # Read directly rather than through the cache, so a full scan doesn't evict practice pages
+                yield from self._load_page(video_id, page)
+
+    def selected_videos(self) -> Tuple[str, ...]:
+        """The session's practice videos that are still in the library, or every video"""
+        selected = tuple(v for v in st.session_state.get('practice_videos', ()) if v in self.counts)
+        return selected or tuple(self.counts)
+
+    def count(self, video_ids: Sequence[str] = None) -> int:
+        return sum(self.counts.get(video_id, 0) for video_id in (video_ids or self.counts))
+
+    def _reshuffle(self, videos: Tuple[str, ...], total: int):
+        st.session_state.sample_order = {
+            'videos': videos,
+            'total': total,
+            'seed': random.getrandbits(32),
+            'pointer': 0,
+        }
+
+    def _current_order(self) -> Optional[dict]:
+        """The session's sampling order, or None if the library or the selection has changed since it was drawn"""
+        order = st.session_state.get('sample_order')
+        videos = self.selected_videos()
+        if order is None or order['videos'] != videos or order['total'] != self.count(videos):
+            return None
+        return order
+
+    def _locate(self, videos: Tuple[str, ...], position: int) -> Tuple[str, int]:
+        """Map a position across the selected videos to (video_id, idx)"""
+        for video_id in videos:
+            if position < self.counts[video_id]:
+                return video_id, position
+            position -= self.counts[video_id]
+        raise IndexError(position)
+
+    def _pair_at(self, order: dict) -> Tuple[str, str]:
+        position = shuffled_position(order['pointer'], order['total'], order['seed'])
+        return self.get_pair(*self._locate(order['videos'], position))
+
+    def get_random_pair(self) -> Tuple:
+        # Draw a new order on first run, and again when the library or the selection changes
+        order = self._current_order()
+        if order is None:
+            videos = self.selected_videos()
+            total = self.count(videos)
+            if not total:
+                raise Exception("The transcript library is empty. Process a YouTube video first.")
+            self._reshuffle(videos, total)
+            order = st.session_state.sample_order
+
+        pair = self._pair_at(order)
+        order['pointer'] += 1
+
+        # Reshuffle when all sentences are used, so the next pair is always known in advance
+        if order['pointer'] >= order['total']:
+            self._reshuffle(order['videos'], order['total'])
+
+        return pair
+
+    def peek_next_pair(self) -> Optional[Tuple]:
+        """Return the pair the next get_random_pair call will return, without advancing"""
+        order = self._current_order()
+        if order is None:
+            return None
+        return self._pair_at(order)
 
-    def _load_transcript(self, file_path: Path) -> List[str]:
-        """Load and parse transcript file"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return [
-                    line.strip().split(". ", 1)[1] 
-                    for line in f 
-                    if ". " in line and len(line.split(". ", 1)) > 1
-                ]
-        except FileNotFoundError:
-            raise Exception(f"Transcript file not found: {file_path}")
-        except Exception as e:
-            raise Exception(f"Error loading transcript: {str(e)}")
-        
     def load_youtube_transcript(self,file_path:Path) -> str:
         with open(file_path, 'r', encoding='utf-8') as file:
             content = file.read()
             return content
-        
-    def _validate_pairs(self):
-        """Verify English and French transcripts have matching lengths"""
-        if len(self.english_sentences) != len(self.french_sentences):
-            raise ValueError(
-                f"Mismatched transcript lengths: "
-                f"English={len(self.english_sentences)}, "
-                f"French={len(self.french_sentences)}"
-            )
-        
-    def get_random_pair(self) -> Tuple  :
-        # Initialize index list on first run
-        if 'shuffled_indices' not in st.session_state or not st.session_state.shuffled_indices:
-            indices = list(range(len(self.english_sentences)))
-            random.shuffle(indices)
-            st.session_state.shuffled_indices = indices
-            st.session_state.index_pointer = 0
-
-        idx = st.session_state.shuffled_indices[st.session_state.index_pointer]
-        st.session_state.index_pointer += 1
-
-        # Reset when all sentences are used
-        if st.session_state.index_pointer >= len(self.english_sentences):
-            st.session_state.shuffled_indices = []
-            st.session_state.index_pointer = 0
-
-        return self.english_sentences[idx], self.french_sentences[idx]
-    
-
-
-    def extract_transcript(self, video_url: str):
-    
-        # Extract video ID from different YouTube URL formats
-        parsed_url = urlparse(video_url)
-        
-        if parsed_url.hostname in ['youtube.com', 'www.youtube.com', 'm.youtube.com']:
-            if parsed_url.path == '/watch':
-                video_id = parse_qs(parsed_url.query).get('v', [None])[0]
-            elif parsed_url.path.startswith('/embed/'):
-                video_id = parsed_url.path.split('/')[2]
-            elif parsed_url.path.startswith('/v/'):
-                video_id = parsed_url.path.split('/')[2]
-        elif parsed_url.hostname == 'youtu.be':
-            video_id = parsed_url.path[1:]  # Remove the leading slash
-        else:
-            raise ValueError("Invalid YouTube URL")
-        
-        if not video_id:
-            raise ValueError("Could not extract video ID from URL")
-        
+
+    def extract_transcript(self, video_url: str) -> str:
+        """
+        Fetch a video's French transcript, one snippet per line. A copy is written
+        to TRANSCRIPT_YOUTUBE for debugging only; ingestion uses the returned text.
+        """
+        video_id = parse_video_id(video_url)
+
+        from youtube_transcript_api import YouTubeTranscriptApi
         ytt_api = YouTubeTranscriptApi()
         fetched_transcript = ytt_api.fetch(video_id, languages=["fr"])
-        sentences = []
+        # One snippet per line so ingestion can chunk at snippet boundaries
+        snippets = []
         for snippet in fetched_transcript:
-            sentences.append(snippet.text)
-        transcript = " ".join(sentences)
+            snippets.append(" ".join(snippet.text.split()))
+        transcript = "\n".join(snippets)
         try:
             with open(TRANSCRIPT_YOUTUBE, "w", encoding="utf-8") as file:
                 file.write(transcript)
                 print(f"Transcript saved to {TRANSCRIPT_YOUTUBE}")
         except IOError as e:
             print(f"An error occurred while writing to the file: {e}")
-
-
-transcript_manager = TranscriptManager()
\ No newline at end of file
+        return transcript
@@ -0,0 +1,109 @@
+import re
+import sqlite3
+import threading
+import unicodedata
+from typing import Dict, List
+from config.settings import SEARCH_FUZZY_CANDIDATES, SEARCH_FUZZY_THRESHOLD
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents so 'Élève' and 'eleve' compare equal"""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return text.replace("œ", "oe").replace("æ", "ae")
+
+
+def trigrams(text: str) -> set:
+    """Character trigrams of a folded word, padded so prefixes weigh more"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class VocabSearchIndex:
+    """
+    In-memory search index over saved words, built once from a word list.
+
+    - An FTS5 table (unicode61 tokenizer with diacritics removed) answers prefix
+      and accent-insensitive queries over words and meanings, ranked by bm25
+      with the word column weighted above the meaning.
+    - A trigram table gives typo tolerance: words sharing the most trigrams
+      with the query are re-ranked by Dice similarity.
+
+    Results are ordered exact word match, then word prefix match, then other
+    full-text matches, then fuzzy matches (only looked up when no word matches
+    the query exactly).
+    """
+
+    def __init__(self, rows: List[Dict]):
+        self.rows = list(rows)
+        self._folded = [fold(row['word']) for row in self.rows]
+        self._gram_counts = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE words_fts USING fts5("
+            "word, meaning, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        # Rank full-text matches with the word column weighted above the meaning
+        self._conn.execute("INSERT INTO words_fts (words_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+        self._conn.execute("CREATE TABLE word_grams (gram TEXT, id INTEGER)")
+        self._conn.executemany(
+            "INSERT INTO words_fts (rowid, word, meaning) VALUES (?, ?, ?)",
+            [(i, row['word'], row['meaning'] or '') for i, row in enumerate(self.rows)]
+        )
+        grams = []
+        for i, word in enumerate(self._folded):
+            word_grams = trigrams(word)
+            self._gram_counts.append(len(word_grams))
+            grams.extend((gram, i) for gram in word_grams)
+        self._conn.executemany("INSERT INTO word_grams (gram, id) VALUES (?, ?)", grams)
+        self._conn.execute("CREATE INDEX idx_word_grams ON word_grams (gram, id)")
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def search(self, query: str, limit: int = 50) -> List[Dict]:
+        """Saved-word rows matching `query`, best first"""
+        folded = fold(query.strip())
+        tokens = re.findall(r"\w+", folded)
+        if not tokens:
+            return []
+
+        ranked = {}
+        match = " ".join(f'"{token}"*' for token in tokens)
+        with self._lock:
+            hits = self._conn.execute(
+                "SELECT rowid FROM words_fts WHERE words_fts MATCH ? ORDER BY rank LIMIT ?",
+                (match, limit)
+            ).fetchall()
+            for position, (i,) in enumerate(hits):
+                word = self._folded[i]
+                tier = 0 if word == folded else 1 if word.startswith(folded) else 2
+                ranked[i] = (tier, position)
+
+            # Typo tolerance is only needed when the query isn't already a saved word
+            exact = any(tier == 0 for tier, _ in ranked.values())
+            if not exact and len(ranked) < limit:
+                for score, i in self._fuzzy(folded):
+                    if i not in ranked:
+                        ranked[i] = (3, -score)
+
+        order = sorted(ranked, key=ranked.get)[:limit]
+        return [self.rows[i] for i in order]
+
+    def _fuzzy(self, folded: str) -> List[tuple]:
+        """(Dice similarity, id) for words sharing enough trigrams with the query"""
+        query_grams = trigrams(folded)
+        placeholders = ",".join("?" * len(query_grams))
+        candidates = self._conn.execute(
+            f"SELECT id, COUNT(*) AS shared FROM word_grams WHERE gram IN ({placeholders}) "
+            f"GROUP BY id ORDER BY shared DESC LIMIT ?",
+            (*query_grams, SEARCH_FUZZY_CANDIDATES)
+        ).fetchall()
+        matches = []
+        for i, shared in candidates:
+            score = 2 * shared / (len(query_grams) + self._gram_counts[i])
+            if score >= SEARCH_FUZZY_THRESHOLD:
+                matches.append((score, i))
+        return matches
@@ -1,23 +1,58 @@
 import streamlit as st
-from core.database import get_score_history, get_daily_scores, get_weekly_progress, get_score_statistics
-from core.database_supabase import SupabaseDB
+from core.resources import get_backend, get_repository
 import altair as alt
 import pandas as pd
 
-supabase_client = SupabaseDB()
+
+@st.cache_data(show_spinner="Loading your progress...", max_entries=8)
+def load_score_aggregates(backend: str, version):
+    """
+    (statistics, daily) from the trigger-maintained per-day totals, so their cost
+    grows with days rather than attempts. Daily rows are returned oldest first.
+    Cached per backend and score version.
+    """
+    repo = get_repository(backend)
+    stats = repo.get_score_statistics()
+    daily = repo.get_daily_scores()
+    if daily.empty:
+        daily = pd.DataFrame(columns=['date', 'attempt_count', 'avg_score', 'min_score', 'max_score'])
+    daily['date'] = pd.to_datetime(daily['date'])
+    daily['avg_score'] = daily['avg_score'].astype(float)
+    return stats, daily.sort_values('date', ignore_index=True)
+
+
+@st.cache_data(show_spinner="Loading your progress...", max_entries=8)
+def load_score_snapshot(backend: str, version) -> pd.DataFrame:
+    """
+    Score history as (score, checked_on) rows, oldest first, for the per-attempt
+    charts. Cached per backend and score version, so the history is fetched again
+    only after a score is saved or deleted.
+    """
+    df = get_repository(backend).get_score_history()
+    if df.empty:
+        return pd.DataFrame({'score': pd.Series(dtype='int64'), 'checked_on': pd.Series(dtype='datetime64[ns]')})
+    df = df.rename(columns={'Score': 'score'})[['score', 'checked_on']]
+    df['checked_on'] = pd.to_datetime(df['checked_on'])
+    return df.sort_values('checked_on', kind='stable', ignore_index=True)
+
 
 def analyse():
+    repo = get_repository()
     st.divider()
     st.markdown("#### 📊 Analysis")
     
-    # Get data from Supabase and check availability
+    # Metrics and the daily charts read the aggregate tables; only the
+    # per-attempt charts need the history. Both are cached per score version
     try:
-        stats = supabase_client.get_score_statistics()
+        backend = get_backend()
+        version = repo.get_score_version()
+        stats, daily = load_score_aggregates(backend, version)
         if not stats or stats.get('total_attempts', 0) == 0:
             st.info("Complete some translations to see your progress")
             return
+        history = load_score_snapshot(backend, version)
     except Exception as e:
-        st.error(f"Error loading statistics: {e}")
+        st.error(f"Error loading score history: {e}")
         return
     
     # Overview metrics - clean and simple
@@ -32,20 +67,7 @@ def analyse():
     st.divider()
     
     # Score progression - single clean chart
-    try:
-        df = supabase_client.get_score_history()
-        if df.empty:
-            st.info("No score history available yet")
-            return
-    except Exception as e:
-        st.error(f"Error loading score history: {e}")
-        return
-        
-    score_col = 'score' if 'score' in df.columns else 'Score'
-    if score_col not in df.columns:
-        st.error("Score data unavailable")
-        return
-        
+    df = history.copy()
     df["attempt"] = range(1, len(df) + 1)
     
     # Create base chart with transparent background
@@ -59,25 +81,25 @@ def analyse():
         strokeWidth=1
     ).encode(
         x=alt.X("attempt:O", title="Attempt"),
-        y=alt.Y(f"{score_col}:Q", title="Score", scale=alt.Scale(domain=[0, 10])),
+        y=alt.Y("score:Q", title="Score", scale=alt.Scale(domain=[0, 10])),
         color=alt.Color(
-            f"{score_col}:Q", 
+            "score:Q", 
             scale=alt.Scale(scheme='blues', domain=[0, 10]),
             legend=None
         ),
-        tooltip=["attempt", score_col]
+        tooltip=["attempt", "score"]
     )
     
     # Trend line layer
     trend = base.transform_regression(
-        "attempt", score_col
+        "attempt", "score"
     ).mark_line(
         color="#ff6b6b", 
         strokeWidth=3,
         opacity=0.8
     ).encode(
         x=alt.X("attempt:O"),
-        y=alt.Y(f"{score_col}:Q")
+        y=alt.Y("score:Q")
     )
     
     # Combine layers and configure
@@ -92,7 +114,7 @@ def analyse():
     st.altair_chart(chart, use_container_width=True)
     
     # Simple stats below chart
-    improvement = df[score_col].iloc[-5:].mean() - df[score_col].iloc[:5].mean() if len(df) >= 10 else 0
+    improvement = df['score'].iloc[-5:].mean() - df['score'].iloc[:5].mean() if len(df) >= 10 else 0
     if improvement > 0:
         st.success(f"↗️ Improved by {improvement:.1f} points")
     elif improvement < -2:
@@ -105,71 +127,56 @@ def analyse():
     st.markdown("#### 📦 Daily Score Variation (Last 5 Days)")
     
     try:
-        # Get individual scores with dates for last 5 days
-        # Using get_score_history() which should have individual records
-        recent_df = supabase_client.get_score_history()
+        # Individual scores with dates for the last 5 days
+        recent_df = history
         if not recent_df.empty:
-            # Handle different possible date column names from your schema
-            date_col = None
-            if 'checked_on' in recent_df.columns:
-                date_col = 'checked_on'
-            elif 'date' in recent_df.columns:
-                date_col = 'date'
-            elif 'created_at' in recent_df.columns:
-                date_col = 'created_at'
-                
-            if date_col:
-                recent_df[date_col] = pd.to_datetime(recent_df[date_col])
-                
-                # Filter for last 5 days
-                cutoff_date = recent_df[date_col].max() - pd.Timedelta(days=4)
-                recent_df = recent_df[recent_df[date_col] >= cutoff_date].copy()
+            # Filter for last 5 days
+            cutoff_date = recent_df['checked_on'].max() - pd.Timedelta(days=4)
+            recent_df = recent_df[recent_df['checked_on'] >= cutoff_date].copy()
+            
+            # Create day label and date for sorting
+            recent_df['day'] = recent_df['checked_on'].dt.strftime('%a %m/%d')
+            recent_df['date_only'] = recent_df['checked_on'].dt.date
+            
+            # Group by day to see how many days we have
+            daily_groups = recent_df.groupby('date_only').size()
+            
+            if len(daily_groups) >= 2:  # Show if we have at least 2 days
+                # Box plot
+                box_plot = alt.Chart(recent_df).configure(
+                    background='transparent'
+                ).configure_view(
+                    strokeWidth=0
+                ).mark_boxplot(
+                    size=50,
+                    color='#4A90E2',
+                    opacity=0.7
+                ).encode(
+                    x=alt.X('day:O', title="Day", sort=alt.Sort(field='date_only')),
+                    y=alt.Y('score:Q', title="Score", scale=alt.Scale(domain=[0, 10])),
+                    tooltip=['day:O', 'score:Q']
+                ).properties(height=250)
                 
-                # Create day label and date for sorting
-                recent_df['day'] = recent_df[date_col].dt.strftime('%a %m/%d')
-                recent_df['date_only'] = recent_df[date_col].dt.date
+                st.altair_chart(box_plot, use_container_width=True)
                 
-                # Group by day to see how many days we have
-                daily_groups = recent_df.groupby('date_only').size()
+                # Quick insights
+                daily_stats = recent_df.groupby(['day', 'date_only'])['score'].agg(['mean', 'std', 'count']).round(1)
+                daily_stats = daily_stats.reset_index()
                 
-                if len(daily_groups) >= 2:  # Show if we have at least 2 days
-                    # Box plot
-                    box_plot = alt.Chart(recent_df).configure(
-                        background='transparent'
-                    ).configure_view(
-                        strokeWidth=0
-                    ).mark_boxplot(
-                        size=50,
-                        color='#4A90E2',
-                        opacity=0.7
-                    ).encode(
-                        x=alt.X('day:O', title="Day", sort=alt.Sort(field='date_only')),
-                        y=alt.Y(f'{score_col}:Q', title="Score", scale=alt.Scale(domain=[0, 10])),
-                        tooltip=['day:O', f'{score_col}:Q']
-                    ).properties(height=250)
-                    
-                    st.altair_chart(box_plot, use_container_width=True)
+                if len(daily_stats) > 1:
+                    most_consistent_day = daily_stats.loc[daily_stats['std'].idxmin(), 'day']
+                    most_variable_day = daily_stats.loc[daily_stats['std'].idxmax(), 'day']
                     
-                    # Quick insights
-                    daily_stats = recent_df.groupby(['day', 'date_only'])[score_col].agg(['mean', 'std', 'count']).round(1)
-                    daily_stats = daily_stats.reset_index()
-                    
-                    if len(daily_stats) > 1:
-                        most_consistent_day = daily_stats.loc[daily_stats['std'].idxmin(), 'day']
-                        most_variable_day = daily_stats.loc[daily_stats['std'].idxmax(), 'day']
-                        
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.caption(f"🎯 Most consistent: {most_consistent_day}")
-                        with col2:
-                            st.caption(f"🎲 Most variable: {most_variable_day}")
-                    
-                    # Show summary stats
-                    st.caption(f"📊 Showing {len(recent_df)} attempts across {len(daily_groups)} days")
-                else:
-                    st.info("Need attempts from at least 2 different days for box plot")
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.caption(f"🎯 Most consistent: {most_consistent_day}")
+                    with col2:
+                        st.caption(f"🎲 Most variable: {most_variable_day}")
+                
+                # Show summary stats
+                st.caption(f"📊 Showing {len(recent_df)} attempts across {len(daily_groups)} days")
             else:
-                st.info("Date information not available for box plot")
+                st.info("Need attempts from at least 2 different days for box plot")
         else:
             st.info("No recent data available for box plot")
     except Exception as e:
@@ -178,10 +185,9 @@ def analyse():
     # Time-based progress - simplified
     with st.expander("📅 Progress Over Time", expanded=False):
         try:
-            daily_df = supabase_client.get_daily_scores()
+            daily_df = daily
             if not daily_df.empty:
-                daily_df['date'] = pd.to_datetime(daily_df['date'])
-                daily_df = daily_df.sort_values('date').tail(30)  # Last 30 days only
+                daily_df = daily_df.tail(30)  # Last 30 days only
                 
                 daily_chart = alt.Chart(daily_df).configure(
                     background='transparent'
@@ -214,7 +220,7 @@ def analyse():
                 cornerRadiusTopLeft=2,
                 cornerRadiusTopRight=2
             ).encode(
-                x=alt.X(f'{score_col}:Q', bin=alt.Bin(maxbins=15), title="Score"),
+                x=alt.X('score:Q', bin=alt.Bin(maxbins=15), title="Score"),
                 y=alt.Y('count()', title="Count"),
                 color=alt.value('#4A90E2'),
                 opacity=alt.value(0.7)
@@ -223,16 +229,14 @@ def analyse():
             st.altair_chart(hist, use_container_width=True)
             
             # Quick stats
-            median_score = df[score_col].median()
+            median_score = df['score'].median()
             st.caption(f"Median score: {median_score:.1f} | Most common range: {int(median_score//10)*10}-{int(median_score//10)*10+10}")
     
     # Attempts per day over whole period
     with st.expander("📊 Daily Attempt Frequency", expanded=False):
         try:
-            daily_df = supabase_client.get_daily_scores()
+            daily_df = daily
             if not daily_df.empty:
-                daily_df['date'] = pd.to_datetime(daily_df['date'])
-                daily_df = daily_df.sort_values('date')
                 
                 # Bar chart showing attempts per day
                 attempts_chart = alt.Chart(daily_df).configure(
@@ -1,12 +1,62 @@
-from core.transcript_processing import TranscriptManager
 import streamlit as st
-from config.settings import TRANSCRIPT_YOUTUBE, TRANSCRIPT_EN, TRANSCRIPT_FR, LINK_YOUTUBE
-from core.llm_utils import LLMUtils
+from config.settings import BACKGROUND_POLL_INTERVAL, TRANSCRIPT_PAGE_SIZE
+from core.background import submit
+from core.database import delete_transcript_video
+from core.resources import get_llm_utils, get_transcript_manager
+from core.ingestion import IngestionProgress, run_ingestion
+
+STAGE_LABELS = {
+    'fetch': "Fetching the YouTube transcript",
+    'segment': "Extracting French sentences",
+    'translate': "Translating into English",
+}
+
+
+def format_timings(timings):
+    return " · ".join(f"{stage} {timings[stage]:.1f}s" for stage in IngestionProgress.STAGES if stage in timings)
+
+
+@st.fragment(run_every=BACKGROUND_POLL_INTERVAL)
+def ingestion_status():
+    """Poll the background ingestion job, showing its stage and progress, and rerun the page once it has finished"""
+    if st.session_state.ingestion_job.done():
+        st.rerun()
+    snapshot = st.session_state.ingestion_progress.snapshot()
+    stage = snapshot['stage']
+    st.caption(f"⏳ {STAGE_LABELS.get(stage, 'Starting')}...")
+    if snapshot['total']:
+        st.progress(snapshot['done'] / snapshot['total'], text=f"{snapshot['done']} / {snapshot['total']}")
+    if snapshot['sentences_written']:
+        st.caption(f"✅ {snapshot['sentences_written']} sentence pairs ready to practise")
+    if snapshot['timings']:
+        st.caption(format_timings(snapshot['timings']))
+    for sentence in snapshot['preview']:
+        st.text(sentence)
+
+
+def render_ingestion_result():
+    job = st.session_state.get('ingestion_job')
+    if job is None:
+        return
+    if not job.done():
+        ingestion_status()
+        return
+    timings = format_timings(st.session_state.ingestion_progress.snapshot()['timings'])
+    try:
+        count = job.result()
+    except FileNotFoundError:
+        st.error("Error: Transcript file not found.")
+        return
+    except Exception as e:
+        st.error(f"An error occurred during processing: {str(e)}")
+        return
+    st.success(f"✅ {count} French sentences extracted and translated!")
+    st.caption(timings)
 
-llm_utils = LLMUtils()
-transcript_manager = TranscriptManager()
 
 def transcript_render():
+    llm_utils = get_llm_utils()
+    transcript_manager = get_transcript_manager()
     
     st.divider()
     st.markdown("#### 🎯 Update Transcript")
@@ -14,53 +64,58 @@ def transcript_render():
     st.caption("You need to provide YouTube url to extract the transcript and generate translations.")
 
     # Use a single expander for the entire video processing section to keep it tidy
-    with st.expander("🎥 Process a New YouTube Video"):
-        video_id = st.text_input("Enter YouTube Video url:", placeholder="e.g. https://www.youtube.com/watch?v=VIDEO_ID", key="video_url")
+    with st.expander("🎥 Process a New YouTube Video", expanded='ingestion_job' in st.session_state):
+        video_url = st.text_input("Enter YouTube Video url:", placeholder="e.g. https://www.youtube.com/watch?v=VIDEO_ID", key="video_url")
+        job = st.session_state.get('ingestion_job')
+        running = job is not None and not job.done()
 
-        if st.button("Extract and Process Transcript", use_container_width=True):
-            if not video_id:
+        if st.button("Extract and Process Transcript", use_container_width=True, disabled=running):
+            if not video_url:
                 st.warning("Please enter Youtube url.")
                 return
 
-            # Save the video URL to file when processing starts
-            try:
-                with open(LINK_YOUTUBE, "w", encoding="utf-8") as file:
-                    file.write(video_id)
-            except Exception as e:
-                st.error(f"Error saving YouTube link: {str(e)}")
-                return
+            # Runs in the background; sentence pairs are stored in the library batch by batch
+            # as they are translated, and the shared reader reloaded so they can be practised at once
+            progress = IngestionProgress()
+            st.session_state.ingestion_progress = progress
+            st.session_state.ingestion_job = submit(
+                run_ingestion, video_url, llm_utils, transcript_manager, progress,
+                on_written=get_transcript_manager.clear
+            )
 
-            st.info("Processing transcript... This may take a moment.")
-            
-            try:
-                # Step 1: Extract the YouTube transcript
-                transcript_manager.extract_transcript(video_id)
-                st.success("✅ Transcript extracted successfully!")
-                
-                # Step 2: Generate French sentences
-                transcript = transcript_manager.load_youtube_transcript(TRANSCRIPT_YOUTUBE)
-                french_sentences = llm_utils.youtube_french_sentence_generator(transcript)
-                with open(TRANSCRIPT_FR, "w", encoding="utf-8") as file:
-                    file.write(french_sentences)
-                st.success("✅ French sentences generated!")
-
-                # Step 3: Generate English translations
-                english_sentences = llm_utils.youtube_english_sentence_generator(french_sentences)
-                with open(TRANSCRIPT_EN, "w", encoding="utf-8") as file:
-                    file.write(english_sentences)
-                st.success("✅ English translations generated!")
-            
-            except FileNotFoundError:
-                st.error("Error: Transcript file not found.")
-            except Exception as e:
-                st.error(f"An error occurred during processing: {str(e)}")
+        render_ingestion_result()
     
     st.markdown("---")
 
+    st.markdown("#### 📚 Transcript Library")
+    videos = transcript_manager.videos
+    if not videos:
+        st.info("No transcripts in the library yet. Please process a video first.")
+        return
+    labels = {video_id: f"{video_id} ({count} sentences)" for video_id, _, _, count in videos}
+    urls = {video_id: url for video_id, url, _, _ in videos}
+
+    # The widget's own state is dropped on other pages, so the selection is kept in practice_videos
+    st.session_state.practice_videos_select = [
+        video_id for video_id in st.session_state.get('practice_videos_select', st.session_state.get('practice_videos', []))
+        if video_id in labels
+    ]
+    st.session_state.practice_videos = st.multiselect(
+        "Practise sentences from (leave empty for all videos):", options=list(labels),
+        format_func=labels.get, key="practice_videos_select"
+    )
+    practice_count = transcript_manager.count(transcript_manager.selected_videos())
+    st.caption(f"{practice_count} sentence pairs from {len(transcript_manager.selected_videos())} of {len(videos)} videos in practice.")
+
     st.markdown("#### 📜 Transcript Viewer")
+    video_id = st.selectbox("Video:", options=list(labels), format_func=labels.get, key="viewer_video")
+    pages = -(-transcript_manager.counts[video_id] // TRANSCRIPT_PAGE_SIZE)
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages}):", min_value=1, max_value=pages, value=1, key=f"viewer_page_{video_id}")
     
     # Use columns to align the buttons side-by-side
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     
     # Use session state to manage which transcript to display
     if 'display_transcript' not in st.session_state:
@@ -73,35 +128,39 @@ def transcript_render():
     with col2:
         if st.button("Show English Transcript", use_container_width=True):
             st.session_state.display_transcript = 'en'
+
+    with col3:
+        if st.button("Remove from Library", use_container_width=True, disabled=running):
+            try:
+                delete_transcript_video(video_id)
+            except Exception as e:
+                st.error(f"Error deleting video: {e}")
+            else:
+                get_transcript_manager.clear()
+                st.rerun()
     
     if st.session_state.display_transcript:
         try:
+            english, french = zip(*transcript_manager.get_page(video_id, page - 1))
             if st.session_state.display_transcript == 'fr':
-                file_path = TRANSCRIPT_FR
+                sentences = french
                 title = "French Transcript"
             else:
-                file_path = TRANSCRIPT_EN
+                sentences = english
                 title = "English Transcript"
-            
-            transcript_content = transcript_manager.load_youtube_transcript(file_path)
+
+            first = (page - 1) * TRANSCRIPT_PAGE_SIZE + 1
+            transcript_content = "\n".join(f"{number}. {sentence}" for number, sentence in enumerate(sentences, start=first))
             st.subheader(title)
-            st.text_area("Content", value=transcript_content, height=500, key=title)
-        except FileNotFoundError:
-            st.error("Transcript file not found. Please process a video first.")
+            st.text_area("Content", value=transcript_content, height=500, key=f"{title}_{video_id}_{page}")
         except Exception as e:
             st.error(f"Error loading transcript: {str(e)}")
             
     st.divider()
     st.markdown("#### 🎬 YouTube Video Link")
     
-    # YouTube link display with proper error handling
-    try:
-        youtube_link = transcript_manager.load_youtube_transcript(LINK_YOUTUBE)
-        if youtube_link and youtube_link.strip() and youtube_link.startswith(('http://', 'https://')):
-            st.link_button("🎥 Click here to open the YouTube video", youtube_link)
-        else:
-            st.info("No valid YouTube link available. Please process a video first.")
-    except FileNotFoundError:
-        st.info("No YouTube link found. Please process a video first.")
-    except Exception as e:
-        st.error(f"Error loading YouTube link: {str(e)}")
\ No newline at end of file
+    youtube_link = urls.get(video_id)
+    if youtube_link and youtube_link.startswith(('http://', 'https://')):
+        st.link_button("🎥 Click here to open the YouTube video", youtube_link)
+    else:
+        st.info("No valid YouTube link available for this video.")
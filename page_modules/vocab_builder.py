@@ -1,75 +1,26 @@
+import math
 import streamlit as st
-from core.llm_utils import LLMUtils
-from core.audio import play_audio, play_audio_mobile_compatible
-from core.database import save_score, save_missing_words, get_all_saved_words, delete_saved_word
-import sqlite3
-from config.settings import DB_PATH
-from core.database_supabase import SupabaseDB
+import pandas as pd
+from core.audio import play_audio_mobile_compatible
+from core.resources import get_backend, get_llm_utils, get_repository
+from core.vocab_search import VocabSearchIndex
+from config.settings import VOCAB_PAGE_SIZE, SEARCH_RESULT_LIMIT
 
 
-llm_utils = LLMUtils()
+@st.cache_resource(show_spinner="Indexing vocabulary...", max_entries=2)
+def load_search_index(backend: str, version) -> VocabSearchIndex:
+    """Search index over all saved words, rebuilt only when words are added or deleted"""
+    return VocabSearchIndex(get_repository(backend).get_all_saved_words(include_conjugation=False))
+
 
-def get_database_client():
-    """Get database client with fallback logic"""
-    try:
-        supabase_client = SupabaseDB()
-        # Test connection
-        supabase_client.get_all_saved_words()
-        return supabase_client, "supabase"
-    except Exception:
-        return None, "sqlite"
 
 def vocab_builder():
-    # Get database client
-    db_client, db_type = get_database_client()
-    
-    # Initialize session state for selected words
-    if 'selected_words' not in st.session_state:
-        st.session_state.selected_words = set()
+    llm_utils = get_llm_utils()
+    repo = get_repository()
     
     # Minimal CSS for compact layout
     st.markdown("""
     <style>
-        .word-row {
-            display: flex;
-            align-items: center;
-            background: rgba(255, 255, 255, 0.05);
-            border-radius: 8px;
-            padding: 12px;
-            margin: 8px 0;
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            gap: 15px;
-        }
-        
-        .word-col {
-            flex: 2;
-            min-width: 120px;
-        }
-        
-        .meaning-col {
-            flex: 3;
-            min-width: 180px;
-        }
-        
-        .action-col {
-            flex: 1;
-            min-width: 100px;
-            display: flex;
-            gap: 8px;
-            justify-content: flex-end;
-        }
-        
-        .word-text {
-            font-weight: 600;
-            color: #A7F3D0;
-            margin: 0;
-        }
-        
-        .meaning-text {
-            color: rgba(255, 255, 255, 0.9);
-            font-size: 0.95rem;
-            margin: 0;
-        }
         .stButton>button {
             height: 38px;
             display: flex;
@@ -85,14 +36,9 @@ def vocab_builder():
     st.markdown("#### 📚 Vocabulary")
     st.caption("Build your French vocabulary by adding new words and their meanings. You can also listen to the pronunciation of each word.")
     
-    # Get total word count based on database type
+    # Get total word count
     try:
-        if db_type == "supabase" and db_client:
-            saved_words_data = db_client.get_all_saved_words()
-            total_words = len(saved_words_data)
-        else:
-            with sqlite3.connect(DB_PATH) as conn:
-                total_words = conn.execute("SELECT COUNT(*) FROM missing_words").fetchone()[0]
+        total_words = repo.count_saved_words()
     except Exception as e:
         st.error(f"Error getting word count: {e}")
         total_words = 0
@@ -118,41 +64,20 @@ def vocab_builder():
                 st.warning("Word must be longer than 3 characters")
             else:
                 try:
-                    if db_type == "supabase" and db_client:
-                        # Check if word exists in Supabase
-                        existing_words = db_client.supabase.table('missing_words').select('word').eq('word', new_word).execute()
-                        
-                        if existing_words.data:
-                            st.info(f"'{new_word}' already exists")
-                        else:
-                            with st.spinner("Getting meaning..."):
-                                # Correct French accents
-                                corrected_word = llm_utils.correct_french_accents(new_word)
-                                # Get meaning
-                                meaning = llm_utils.get_french_word_meaning(corrected_word)
-                                
-                                # Save to Supabase
-                                db_client.supabase.table('missing_words').insert({
-                                    'word': corrected_word,
-                                    'meaning': meaning
-                                }).execute()
-                                
-                            st.success(f"Added '{corrected_word}' to Supabase")
-                            st.rerun()
+                    if repo.word_exists(new_word):
+                        st.info(f"'{new_word}' already exists")
                     else:
-                        # Use SQLite
-                        with sqlite3.connect(DB_PATH) as conn:
-                            existing = conn.execute("SELECT 1 FROM missing_words WHERE word = ?", (new_word,)).fetchone()
-                            if existing:
-                                st.info(f"'{new_word}' already exists")
-                            else:
-                                with st.spinner("Getting meaning..."):
-                                    corrected_word = llm_utils.correct_french_accents(new_word)
-                                    meaning = llm_utils.get_french_word_meaning(corrected_word)
-                                    conn.execute("INSERT INTO missing_words (word, meaning) VALUES (?, ?)", (corrected_word, meaning))
-                                    conn.commit()
-                                st.success(f"Added '{corrected_word}' to local database")
-                                st.rerun()
+                        with st.spinner("Getting meaning..."):
+                            # Correct French accents
+                            corrected_word = llm_utils.correct_french_accents(new_word)
+                            # Get meaning
+                            meaning = llm_utils.get_french_word_meaning(corrected_word)
+                            added = repo.add_word(corrected_word, meaning)
+                        if added:
+                            st.success(f"Added '{corrected_word}' to vocab")
+                            st.rerun()
+                        else:
+                            st.info(f"'{corrected_word}' already exists")
                                 
                 except Exception as e:
                     st.error(f"Error adding word: {e}")
@@ -160,122 +85,109 @@ def vocab_builder():
     with add_col3:
         if st.button("🔍 Search vocab", key="search_button", use_container_width=True):
             st.session_state.search_term = new_word
+            st.session_state.vocab_page = 1
             st.rerun()
     
     st.divider()
     
-    # Get vocabulary list based on database type
+    search_term = st.session_state.get('search_term', '')
+    
+    # Only the visible page is fetched and rendered, so the cost of a rerun does
+    # not grow with the size of the vocabulary
     try:
-        if db_type == "supabase" and db_client:
-            saved_words_data = db_client.get_all_saved_words()
-            # Convert Supabase data format to match original format (word, meaning, timestamp)
-            saved_words = [(item['word'], item['meaning'], item.get('added_on', '')) for item in saved_words_data]
+        if search_term:
+            # Ranked prefix, accent-insensitive and typo-tolerant matches
+            index = load_search_index(get_backend(), repo.get_vocab_version())
+            matches = index.search(search_term, SEARCH_RESULT_LIMIT)
+            total = len(matches)
         else:
-            saved_words = get_all_saved_words()
+            total = total_words
     except Exception as e:
         st.error(f"Error fetching vocabulary: {e}")
-        saved_words = []
-    
-    search_term = st.session_state.get('search_term', '')
+        return
     
     if search_term:
-        saved_words = [
-            (word, meaning, timestamp) for word, meaning, timestamp in saved_words
-            if search_term.lower() in word.lower() or search_term.lower() in meaning.lower()
-        ]
-        if saved_words:
-            st.write(f"**Found {len(saved_words)} words**")
+        if total:
+            st.write(f"**Found {total} words**")
         else:
             st.info("No words found")
             st.divider()
+            return
+    elif not total:
+        st.info("No words in your vocabulary yet. Add some words above!")
+        st.divider()
+        return
+    
+    page_count = max(1, math.ceil(total / VOCAB_PAGE_SIZE))
+    page = min(max(st.session_state.get('vocab_page', 1), 1), page_count)
+    
+    # Page navigation
+    nav_col1, nav_col2, nav_col3 = st.columns([1, 2, 1])
+    with nav_col1:
+        if st.button("◀ Previous", key="prev_page", disabled=page <= 1, use_container_width=True):
+            st.session_state.vocab_page = page - 1
+            st.rerun()
+    with nav_col2:
+        st.caption(f"Page {page} of {page_count}")
+    with nav_col3:
+        if st.button("Next ▶", key="next_page", disabled=page >= page_count, use_container_width=True):
+            st.session_state.vocab_page = page + 1
+            st.rerun()
+    
+    offset = (page - 1) * VOCAB_PAGE_SIZE
+    try:
+        if search_term:
+            rows = matches[offset:offset + VOCAB_PAGE_SIZE]
+        else:
+            rows = repo.get_saved_words_page(offset, VOCAB_PAGE_SIZE)
+    except Exception as e:
+        st.error(f"Error fetching vocabulary: {e}")
+        return
     
-    if saved_words:
-        # Bulk delete section
-        if len(st.session_state.selected_words) > 0:
-            bulk_col1, bulk_col2, bulk_col3 = st.columns([2, 1, 1])
-            with bulk_col1:
-                st.info(f"{len(st.session_state.selected_words)} words selected")
-            with bulk_col2:
-                if st.button("🗑️ Delete Selected", key="bulk_delete", use_container_width=True):
-                    try:
-                        deleted_count = 0
-                        for word in list(st.session_state.selected_words):
-                            if db_type == "supabase" and db_client:
-                                db_client.delete_saved_word(word)
-                            else:
-                                delete_saved_word(word)
-                            deleted_count += 1
-                        
-                        st.session_state.selected_words.clear()
-                        st.success(f"Deleted {deleted_count} words")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"Error deleting words: {e}")
-            with bulk_col3:
-                if st.button("❌ Clear Selection", key="clear_selection", use_container_width=True):
-                    st.session_state.selected_words.clear()
+    # One table widget for the whole page, with multi-row selection
+    table = pd.DataFrame(rows, columns=['word', 'meaning', 'added_on'])
+    table_key = f"vocab_table_{search_term}_{page}_{st.session_state.get('vocab_selection_nonce', 0)}"
+    event = st.dataframe(
+        table,
+        key=table_key,
+        on_select="rerun",
+        selection_mode="multi-row",
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'word': st.column_config.TextColumn("Word", width="medium"),
+            'meaning': st.column_config.TextColumn("Meaning", width="large"),
+            'added_on': st.column_config.TextColumn("Added", width="small"),
+        }
+    )
+    selected_words = [rows[i]['word'] for i in event.selection.rows]
+    
+    # Bulk actions on the selected rows
+    if selected_words:
+        bulk_col1, bulk_col2, bulk_col3, bulk_col4 = st.columns([2, 1, 1, 1])
+        with bulk_col1:
+            st.info(f"{len(selected_words)} words selected")
+        with bulk_col2:
+            play_clicked = st.button("🔊 Play Selected", key="bulk_play", use_container_width=True)
+        with bulk_col3:
+            if st.button("🗑️ Delete Selected", key="bulk_delete", use_container_width=True):
+                try:
+                    repo.delete_saved_words(selected_words)
+                    st.session_state.vocab_selection_nonce = st.session_state.get('vocab_selection_nonce', 0) + 1
+                    st.success(f"Deleted {len(selected_words)} words")
                     st.rerun()
-            st.divider()
-        
-        # Header row
-        header_cols = st.columns([0.5, 2, 3, 0.5, 0.5])
-        with header_cols[0]:
-            # Select All checkbox
-            select_all = st.checkbox("", key="select_all", label_visibility="collapsed")
-            if select_all:
-                st.session_state.selected_words = set(word for word, _, _ in saved_words)
-                st.rerun()
-            elif not select_all and len(st.session_state.selected_words) == len(saved_words):
-                st.session_state.selected_words.clear()
+                except Exception as e:
+                    st.error(f"Error deleting words: {e}")
+        with bulk_col4:
+            if st.button("❌ Clear Selection", key="clear_selection", use_container_width=True):
+                st.session_state.vocab_selection_nonce = st.session_state.get('vocab_selection_nonce', 0) + 1
                 st.rerun()
-        with header_cols[1]:
-            st.markdown("<div class='word-text' style='color: white;'>Word</div>", unsafe_allow_html=True)
-        with header_cols[2]:
-            st.markdown("<div class='word-text' style='color: white;'>Meaning</div>", unsafe_allow_html=True)
-        with header_cols[3]:
-            st.markdown("<div class='word-text' style='color: white;'>🔊</div>", unsafe_allow_html=True)
-        with header_cols[4]:
-            st.markdown("<div class='word-text' style='color: white;'>🗑️</div>", unsafe_allow_html=True)
-        st.markdown("---")
-
-        # Word rows
-        for word, meaning, timestamp in saved_words:
-            row_cols = st.columns([0.5, 2, 3, 0.5, 0.5])
-            with row_cols[0]:
-                # Individual word checkbox
-                is_selected = st.checkbox("", key=f"select_{word}", 
-                                        value=word in st.session_state.selected_words,
-                                        label_visibility="collapsed")
-                if is_selected:
-                    st.session_state.selected_words.add(word)
-                else:
-                    st.session_state.selected_words.discard(word)
-                    
-            with row_cols[1]:
-                st.markdown(f"<div class='word-text'>{word}</div>", unsafe_allow_html=True)
-            with row_cols[2]:
-                st.markdown(f"<div class='meaning-text'>{meaning}</div>", unsafe_allow_html=True)
-            with row_cols[3]:
-                if st.button("🔊", key=f"audio_{word}", help="Play pronunciation"):
-                    play_audio_mobile_compatible(word)
-            with row_cols[4]:
-                if st.button("🗑️", key=f"delete_{word}", help="Delete"):
-                    try:
-                        if db_type == "supabase" and db_client:
-                            db_client.delete_saved_word(word)
-                            st.success(f"Deleted '{word}' from Supabase")
-                        else:
-                            delete_saved_word(word)
-                            st.success(f"Deleted '{word}' from local database")
-                        st.session_state.selected_words.discard(word)
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"Error deleting word: {e}")
-    
+        if play_clicked:
+            for word in selected_words:
+                st.caption(word)
+                play_audio_mobile_compatible(word)
     else:
-        if not search_term:
-            st.info("No words in your vocabulary yet. Add some words above!")
-            st.divider()
+        st.caption("Select rows to play or delete them.")
 
 # Initialize session state for search
 if 'search_term' not in st.session_state:
@@ -1,14 +1,16 @@
 import streamlit as st
-from core.database import get_all_saved_words, delete_saved_word
-from core.database_supabase import SupabaseDB
 import random
 from core.audio import play_audio_mobile_compatible
-from core.llm_utils import LLMUtils
+from core.resources import get_llm_utils, get_repository
 
-llm_utils = LLMUtils()
-supabase_client = SupabaseDB()
+def load_practice_words():
+    """Fetch saved words as (word, meaning, timestamp, conjugation) tuples"""
+    return [(item['word'], item['meaning'], item['added_on'], item['conjugation'])
+            for item in get_repository().get_all_saved_words()]
 
 def vocab_practise():
+    llm_utils = get_llm_utils()
+    repo = get_repository()
     
     
     st.markdown("""
@@ -46,14 +48,17 @@ def vocab_practise():
     if 'word_index' not in st.session_state:
         st.session_state.word_index = 0
 
-    # Get saved words from Supabase
-    try:
-        saved_words_data = supabase_client.get_all_saved_words()
-        # Convert Supabase data format to match original format (word, meaning, timestamp)
-        saved_words = [(item['word'], item['meaning'], item.get('added_on', '')) for item in saved_words_data]
-    except Exception as e:
-        st.error(f"Error fetching vocabulary: {e}")
-        saved_words = []
+    if 'conjugations' not in st.session_state:
+        st.session_state.conjugations = {}
+
+    # Get saved words once per session; refreshed on "New Word" and "Delete Word"
+    if 'practice_words' not in st.session_state:
+        try:
+            st.session_state.practice_words = load_practice_words()
+        except Exception as e:
+            st.error(f"Error fetching vocabulary: {e}")
+            st.session_state.practice_words = []
+    saved_words = st.session_state.practice_words
 
     if not saved_words:
         st.info("📚 No words available. Add some words to your vocabulary first!")
@@ -64,7 +69,7 @@ def vocab_practise():
         st.session_state.word_index = 0
 
     # Get current word
-    current_word, current_meaning = saved_words[st.session_state.word_index][:2]
+    current_word, current_meaning, _, stored_conjugation = saved_words[st.session_state.word_index]
     
     # Main word display
     st.markdown(f'<div class="english-text"> {current_word}</div>', unsafe_allow_html=True)
@@ -73,18 +78,20 @@ def vocab_practise():
     col1, col2 = st.columns(2)
     with col1:
         if st.button("🔄 New Word", use_container_width=True):
+            st.session_state.pop('practice_words', None)
             st.session_state.word_index = random.randint(0, len(saved_words) - 1)
             st.rerun()
 
     with col2:
         if st.button("🗑️ Delete Word", use_container_width=True):
             try:
-                supabase_client.delete_saved_word(current_word)
+                repo.delete_saved_word(current_word)
                 st.success(f"Deleted word: `{current_word}`")
                 
                 # Update saved_words list after deletion
-                saved_words_data = supabase_client.get_all_saved_words()
-                saved_words = [(item['word'], item['meaning'], item.get('added_on', '')) for item in saved_words_data]
+                saved_words = load_practice_words()
+                st.session_state.practice_words = saved_words
+                st.session_state.conjugations.pop(current_word, None)
                 
                 if len(saved_words) > 0:
                     st.session_state.word_index = random.randint(0, len(saved_words) - 1)
@@ -121,9 +128,15 @@ def vocab_practise():
         if st.button("🔊 Listen sentence",  use_container_width=True):
             play_audio_mobile_compatible(st.session_state.example_sentence,)
     
-    # Conjugation details (if it's a verb)
+    # Conjugation details (if it's a verb) - generated once per word, then served
+    # from the session memo or the copy stored with the word
     try:
-        conjugation_info = llm_utils.conjugation_details(current_word)
+        conjugation_info = st.session_state.conjugations.get(current_word) or stored_conjugation
+        if not conjugation_info:
+            conjugation_info = llm_utils.conjugation_details(current_word)
+            if not conjugation_info.startswith("Error:"):
+                repo.save_conjugation(current_word, conjugation_info)
+                st.session_state.conjugations[current_word] = conjugation_info
         if conjugation_info and "not a verb" not in conjugation_info.lower():
             st.markdown("### 🔄 Conjugation")
             st.info(conjugation_info)
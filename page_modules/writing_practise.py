@@ -1,56 +1,67 @@
 import streamlit as st
-from core.evaluation import check_translation
-from core.database import save_score, save_missing_words
-from core.llm_utils import LLMUtils
-from core.audio import play_audio, play_audio_mobile_compatible
-from core.transcript_processing import TranscriptManager
-import speech_recognition as sr
-import io
-import tempfile
-import os
-from core.database_supabase import SupabaseDB
+from core.evaluation import evaluate_translation
+from core.audio import play_audio, play_audio_mobile_compatible, synthesize_speech
+from core.resources import get_repository, get_transcript_manager
+from core.speech import audio_to_text
+from core.background import submit
+from config.settings import BACKGROUND_POLL_INTERVAL
 
-supabase_client = SupabaseDB()
 
-llm_utils = LLMUtils()
-transcript_manager = TranscriptManager()
+def save_attempt(repo, english, attempt, score, missed):
+    """
+    Background job run after an attempt has been scored: store the missed words
+    with their meanings and record the score. Returns the words added.
+    """
+    added = repo.save_missing_words(missed) if missed else []
+    repo.save_score(english, attempt, score)
+    return added
 
-def audio_to_text(audio_file):
-    """Convert audio file to text using speech recognition"""
+
+@st.fragment(run_every=BACKGROUND_POLL_INTERVAL)
+def pending_save_status():
+    """Poll the background save job and rerun the page once it has finished"""
+    if st.session_state.post_eval_job.done():
+        st.rerun()
+    st.caption("⏳ Saving missed words to your vocabulary...")
+
+
+def render_save_result():
+    job = st.session_state.get('post_eval_job')
+    if job is None:
+        return
+    if not job.done():
+        pending_save_status()
+        return
     try:
-        # Handle UploadedFile object
-        if hasattr(audio_file, 'read'):
-            audio_bytes = audio_file.read()
-        else:
-            audio_bytes = audio_file
-            
-        # Create a temporary file to store the audio
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_audio:
-            temp_audio.write(audio_bytes)
-            temp_audio_path = temp_audio.name
-        
-        # Initialize recognizer
-        recognizer = sr.Recognizer()
-        
-        # Load audio file
-        with sr.AudioFile(temp_audio_path) as source:
-            audio = recognizer.record(source)
-        
-        # Convert to text (you can change language to 'fr-FR' for French)
-        text = recognizer.recognize_google(audio, language='fr-FR')
-        
-        # Clean up temp file
-        os.unlink(temp_audio_path)
-        
-        return text
-    except sr.UnknownValueError:
-        return "Could not understand audio"
-    except sr.RequestError as e:
-        return f"Speech recognition error: {e}"
+        added = job.result()
     except Exception as e:
-        return f"Error processing audio: {e}"
+        st.warning(f"Couldn't save this attempt: {e}")
+        return
+    if added:
+        st.caption(f"📚 Added to your vocabulary: {', '.join(added)}")
+
+
+def prefetch_sentence_assets():
+    """
+    Warm the pronunciation audio for the current and the upcoming sentence in the
+    background, so "Listen to Pronunciation" is served from cache. Runs once per pair.
+    """
+    current_pair = st.session_state.current_pair
+    if st.session_state.get('prefetched_pair') == current_pair:
+        return
+    st.session_state.prefetched_pair = current_pair
+
+    sentences = [current_pair[1]]
+    next_pair = get_transcript_manager().peek_next_pair()
+    if next_pair:
+        sentences.append(next_pair[1])
+    for french in sentences:
+        submit(synthesize_speech, french)
+
 
 def writing():
+    transcript_manager = get_transcript_manager()
+    
     # Initialize session state
     if 'current_pair' not in st.session_state:
         en, fr = transcript_manager.get_random_pair()
@@ -64,6 +75,8 @@ def writing():
             'input_method': 'text'
         })
     
+    prefetch_sentence_assets()
+    
     # Enhanced CSS for cleaner UI
     st.markdown("""
     <style>
@@ -218,19 +231,25 @@ def writing():
     if check_clicked:
         if user_input and user_input.strip():
             st.session_state.user_translation = user_input
-            st.session_state.feedback, st.session_state.score = check_translation(
+            evaluation = evaluate_translation(
                 st.session_state.current_pair[0],
                 user_input,
                 st.session_state.current_pair[1]
             )
+            st.session_state.feedback = evaluation["feedback"]
+            st.session_state.score = evaluation["score"]
             st.session_state.attempt_count += 1
             st.session_state.checked = True
             
-            # Save results
-            missed = llm_utils.extract_missed_words(st.session_state.current_pair[1], user_input)
-            if missed:
-                supabase_client.save_missing_words(missed)
-            supabase_client.save_score(st.session_state.current_pair[0], user_input, st.session_state.score)
+            # Save results in the background so the score shows immediately
+            st.session_state.post_eval_job = submit(
+                save_attempt,
+                get_repository(),
+                st.session_state.current_pair[0],
+                user_input,
+                st.session_state.score,
+                evaluation["missed_words"]
+            )
             
             st.rerun()
         else:
@@ -243,6 +262,7 @@ def writing():
         st.session_state.feedback = ""
         st.session_state.checked = False
         st.session_state.score = 0
+        st.session_state.pop('post_eval_job', None)
         st.rerun()
     
     # Results section with cleaner layout
@@ -306,6 +326,8 @@ def writing():
                     
             st.markdown('</div>', unsafe_allow_html=True)
         
+        render_save_result()
+        
         st.markdown('</div>', unsafe_allow_html=True)
 
 # Optional: Add this if you want to test the component standalone
@@ -1,53 +1,13 @@
 import streamlit as st
 from core.evaluation import check_translation
-from core.database import save_score, save_missing_words
-from core.llm_utils import LLMUtils
 from core.audio import play_audio, play_audio_mobile_compatible
-from core.transcript_processing import TranscriptManager
-import speech_recognition as sr
-import io
-import tempfile
-import os
-
-llm_utils = LLMUtils()
-transcript_manager = TranscriptManager()
-
-def audio_to_text(audio_file):
-    """Convert audio file to text using speech recognition"""
-    try:
-        # Handle UploadedFile object
-        if hasattr(audio_file, 'read'):
-            audio_bytes = audio_file.read()
-        else:
-            audio_bytes = audio_file
-            
-        # Create a temporary file to store the audio
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_audio:
-            temp_audio.write(audio_bytes)
-            temp_audio_path = temp_audio.name
-        
-        # Initialize recognizer
-        recognizer = sr.Recognizer()
-        
-        # Load audio file
-        with sr.AudioFile(temp_audio_path) as source:
-            audio = recognizer.record(source)
-        
-        # Convert to text (you can change language to 'fr-FR' for French)
-        text = recognizer.recognize_google(audio, language='fr-FR')
-        
-        # Clean up temp file
-        os.unlink(temp_audio_path)
-        
-        return text
-    except sr.UnknownValueError:
-        return "Could not understand audio"
-    except sr.RequestError as e:
-        return f"Speech recognition error: {e}"
-    except Exception as e:
-        return f"Error processing audio: {e}"
+from core.resources import get_llm_utils, get_repository, get_transcript_manager
+from core.speech import audio_to_text
 
 def writing():
+    llm_utils = get_llm_utils()
+    transcript_manager = get_transcript_manager()
+    
     # Initialize session state
     if 'current_pair' not in st.session_state:
         en, fr = transcript_manager.get_random_pair()
@@ -169,9 +129,14 @@ def writing():
                 
                 # Save results
                 missed = llm_utils.extract_missed_words(st.session_state.current_pair[1], user_input)
-                if missed:
-                    save_missing_words(missed)
-                save_score(st.session_state.current_pair[0], user_input, st.session_state.score)
+                repo = get_repository()
+                try:
+                    if missed:
+                        repo.save_missing_words(missed)
+                    repo.save_score(st.session_state.current_pair[0], user_input, st.session_state.score)
+                except Exception as e:
+                    st.error(f"Couldn't save this attempt: {e}")
+                    return
                 
                 st.rerun()
             else:
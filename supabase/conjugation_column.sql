@@ -0,0 +1,8 @@
+-- Stored conjugation details for saved words (Supabase / Postgres).
+--
+-- Mirrors migration add_conjugation_column in core/migrations.py: the nullable
+-- missing_words.conjugation column that core/database_supabase.py selects for
+-- Practise Vocabulary and fills in save_conjugation. Run once in the Supabase
+-- SQL editor; it is safe to re-run.
+
+alter table missing_words add column if not exists conjugation text;
@@ -0,0 +1,132 @@
+-- Incrementally maintained score aggregates for Supabase (Postgres).
+--
+-- Mirrors migration add_score_aggregates in core/migrations.py: a trigger keeps
+-- per-day and per-week totals current on every insert into translation_scores,
+-- and the get_daily_scores / get_weekly_progress / get_score_statistics RPCs
+-- used by core/database_supabase.py read those O(days) rows instead of
+-- aggregating every attempt. Weeks use the SQLite definition, so both backends
+-- chart the same buckets: keyed by STRFTIME('%Y-%W') (weeks start on Monday, and
+-- days before a year's first Monday are week 00) with week_start the Sunday
+-- before. Run once in the Supabase SQL editor; it is safe to re-run and rebuilds
+-- the totals from the existing history.
+
+-- STRFTIME('%Y-%W', d) and DATE(d, 'weekday 0', '-7 days') from the SQLite queries
+create or replace function score_week(d date) returns text
+language sql immutable as $$
+    select to_char(d, 'YYYY') || '-'
+           || lpad(((extract(doy from d)::int + 7 - extract(isodow from d)::int) / 7)::text, 2, '0');
+$$;
+
+create or replace function score_week_start(d date) returns date
+language sql immutable as $$
+    select d - extract(isodow from d)::int;
+$$;
+
+create table if not exists daily_scores (
+    day date primary key,
+    attempt_count bigint not null,
+    score_sum bigint not null,
+    min_score integer,
+    max_score integer
+);
+
+-- Earlier versions keyed weeks by their Monday; the table only holds derived totals
+drop table if exists weekly_scores;
+create table weekly_scores (
+    week text primary key,
+    week_start date not null,
+    attempt_count bigint not null,
+    score_sum bigint not null,
+    min_score integer,
+    max_score integer
+);
+
+create or replace function refresh_score_aggregates(days date[]) returns void
+language sql as $$
+    delete from daily_scores where day = any(days);
+    insert into daily_scores (day, attempt_count, score_sum, min_score, max_score)
+    select checked_on::date, count(*), coalesce(sum(score), 0), min(score), max(score)
+    from translation_scores
+    where checked_on::date = any(days)
+    group by checked_on::date;
+
+    delete from weekly_scores
+    where week in (select score_week(d) from unnest(days) as d);
+    insert into weekly_scores (week, week_start, attempt_count, score_sum, min_score, max_score)
+    select score_week(checked_on::date), min(score_week_start(checked_on::date)),
+           count(*), coalesce(sum(score), 0), min(score), max(score)
+    from translation_scores
+    where score_week(checked_on::date) in (select score_week(d) from unnest(days) as d)
+    group by score_week(checked_on::date);
+$$;
+
+create or replace function track_score_aggregates() returns trigger
+language plpgsql as $$
+begin
+    if tg_op = 'INSERT' then
+        insert into daily_scores (day, attempt_count, score_sum, min_score, max_score)
+        values (new.checked_on::date, 1, coalesce(new.score, 0), new.score, new.score)
+        on conflict (day) do update set
+            attempt_count = daily_scores.attempt_count + 1,
+            score_sum = daily_scores.score_sum + excluded.score_sum,
+            min_score = least(daily_scores.min_score, excluded.min_score),
+            max_score = greatest(daily_scores.max_score, excluded.max_score);
+
+        insert into weekly_scores (week, week_start, attempt_count, score_sum, min_score, max_score)
+        values (score_week(new.checked_on::date), score_week_start(new.checked_on::date),
+                1, coalesce(new.score, 0), new.score, new.score)
+        on conflict (week) do update set
+            week_start = least(weekly_scores.week_start, excluded.week_start),
+            attempt_count = weekly_scores.attempt_count + 1,
+            score_sum = weekly_scores.score_sum + excluded.score_sum,
+            min_score = least(weekly_scores.min_score, excluded.min_score),
+            max_score = greatest(weekly_scores.max_score, excluded.max_score);
+        return new;
+    elsif tg_op = 'UPDATE' then
+        perform refresh_score_aggregates(array[old.checked_on::date, new.checked_on::date]);
+        return new;
+    else
+        perform refresh_score_aggregates(array[old.checked_on::date]);
+        return old;
+    end if;
+end;
+$$;
+
+drop trigger if exists trg_score_aggregates on translation_scores;
+create trigger trg_score_aggregates
+    after insert or update or delete on translation_scores
+    for each row execute function track_score_aggregates();
+
+-- Backfill from the existing history
+truncate daily_scores, weekly_scores;
+select refresh_score_aggregates(array(select distinct checked_on::date from translation_scores));
+
+-- Read paths used by the app (dropped first since their return types may differ)
+drop function if exists get_daily_scores();
+drop function if exists get_weekly_progress();
+drop function if exists get_score_statistics();
+
+create or replace function get_daily_scores()
+returns table (date date, attempt_count bigint, avg_score numeric, min_score integer, max_score integer)
+language sql stable as $$
+    select day, attempt_count, score_sum::numeric / attempt_count, min_score, max_score
+    from daily_scores
+    order by day desc;
+$$;
+
+create or replace function get_weekly_progress()
+returns table (week text, week_start date, attempt_count bigint, avg_score numeric, min_score integer, max_score integer)
+language sql stable as $$
+    select week, week_start, attempt_count, score_sum::numeric / attempt_count, min_score, max_score
+    from weekly_scores
+    order by week_start desc;
+$$;
+
+create or replace function get_score_statistics()
+returns table (total_attempts bigint, overall_avg numeric, min_score integer, max_score integer, days_active bigint)
+language sql stable as $$
+    select coalesce(sum(attempt_count), 0)::bigint,
+           sum(score_sum)::numeric / nullif(sum(attempt_count), 0),
+           min(min_score), max(max_score), count(*)
+    from daily_scores;
+$$;